@@ -1,7 +1,7 @@
 import os
 import sys
 from logging.config import fileConfig
-from sqlalchemy import engine_from_config
+from sqlalchemy import engine_from_config, text
 from sqlalchemy import pool
 from alembic import context
 
@@ -50,6 +50,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        version_table_schema=settings.DATABASE_SCHEMA or None,
     )
 
     with context.begin_transaction():
@@ -66,15 +67,24 @@ def run_migrations_online() -> None:
     configuration = config.get_section(config.config_ini_section)
     configuration["sqlalchemy.url"] = settings.DATABASE_URL
     
+    # Same search_path as the application (app/db/session.py), so unqualified
+    # table names in the migrations resolve to its schema
+    connect_args = {"options": f"-csearch_path={settings.DATABASE_SCHEMA},public"} if settings.DATABASE_SCHEMA else {}
     connectable = engine_from_config(
         configuration,
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
+        connect_args=connect_args,
     )
 
     with connectable.connect() as connection:
+        if settings.DATABASE_SCHEMA and settings.DATABASE_SCHEMA != "public":
+            connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {settings.DATABASE_SCHEMA}"))
+            connection.commit()
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            version_table_schema=settings.DATABASE_SCHEMA or None,
         )
 
         with context.begin_transaction():
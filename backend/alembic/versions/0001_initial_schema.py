@@ -0,0 +1,103 @@
+"""Initial schema: tenants, users, products, orders and customers
+
+Databases created with create_tables.py before migrations existed can be
+stamped at this revision (alembic stamp 0001) and then upgraded; the next
+revision only adds what is missing.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'tenant',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('shopify_store_url', sa.String(), nullable=True),
+        sa.Column('shopify_access_token', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_tenant_id', 'tenant', ['id'])
+    op.create_index('ix_tenant_name', 'tenant', ['name'])
+    op.create_index('ix_tenant_shopify_store_url', 'tenant', ['shopify_store_url'], unique=True)
+
+    op.create_table(
+        'user',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(), nullable=True),
+        sa.Column('hashed_password', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('tenant_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenant.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_user_id', 'user', ['id'])
+    op.create_index('ix_user_email', 'user', ['email'], unique=True)
+
+    op.create_table(
+        'product',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('shopify_product_id', sa.String(), nullable=True),
+        sa.Column('title', sa.String(), nullable=True),
+        sa.Column('vendor', sa.String(), nullable=True),
+        sa.Column('product_type', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('tenant_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenant.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_product_id', 'product', ['id'])
+    op.create_index('ix_product_shopify_product_id', 'product', ['shopify_product_id'], unique=True)
+
+    op.create_table(
+        'customer',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('shopify_customer_id', sa.String(), nullable=True),
+        sa.Column('first_name', sa.String(), nullable=True),
+        sa.Column('last_name', sa.String(), nullable=True),
+        sa.Column('email', sa.String(), nullable=True),
+        sa.Column('total_spent', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('tenant_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenant.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_customer_id', 'customer', ['id'])
+    op.create_index('ix_customer_shopify_customer_id', 'customer', ['shopify_customer_id'], unique=True)
+
+    op.create_table(
+        'order',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('shopify_order_id', sa.String(), nullable=True),
+        sa.Column('total_price', sa.Float(), nullable=True),
+        sa.Column('currency', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('tenant_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenant.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_order_id', 'order', ['id'])
+    op.create_index('ix_order_shopify_order_id', 'order', ['shopify_order_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_table('order')
+    op.drop_table('customer')
+    op.drop_table('product')
+    op.drop_table('user')
+    op.drop_table('tenant')
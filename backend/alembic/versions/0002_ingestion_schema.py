@@ -0,0 +1,137 @@
+"""Ingestion schema: line items, sync bookkeeping, content hashes, daily stats
+
+Tables and columns added since the initial schema. Databases created with
+create_tables.py may already have any of them, so each one is only added
+when missing. Indexes on the pre-existing tables are built in the next
+revision, concurrently.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(table: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(table)
+
+
+def _add_column(table: str, column: sa.Column):
+    if column.name not in {existing['name'] for existing in sa.inspect(op.get_bind()).get_columns(table)}:
+        op.add_column(table, column)
+
+
+def upgrade() -> None:
+    _add_column('tenant', sa.Column('timezone', sa.String(), server_default='UTC', nullable=True))
+    for table in ('product', 'order', 'customer'):
+        _add_column(table, sa.Column('content_hash', sa.BigInteger(), nullable=True))
+    _add_column('order', sa.Column('shopify_customer_id', sa.String(), nullable=True))
+    _add_column('order', sa.Column(
+        'customer_id', sa.Integer(), sa.ForeignKey('customer.id', ondelete='SET NULL'), nullable=True,
+    ))
+
+    if not _has_table('order_line_item'):
+        op.create_table(
+            'order_line_item',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('shopify_line_item_id', sa.String(), nullable=False),
+            sa.Column('shopify_order_id', sa.String(), nullable=False),
+            sa.Column('shopify_product_id', sa.String(), nullable=True),
+            sa.Column('shopify_variant_id', sa.String(), nullable=True),
+            sa.Column('title', sa.String(), nullable=True),
+            sa.Column('sku', sa.String(), nullable=True),
+            sa.Column('quantity', sa.Integer(), nullable=True),
+            sa.Column('price', sa.Float(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('order_id', sa.Integer(), nullable=True),
+            sa.Column('content_hash', sa.BigInteger(), nullable=True),
+            sa.Column('tenant_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['order_id'], ['order.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['tenant_id'], ['tenant.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_order_line_item_id', 'order_line_item', ['id'])
+        op.create_index('ix_order_line_item_order_id', 'order_line_item', ['order_id'])
+        op.create_index(
+            'ix_order_line_item_tenant_id_shopify_line_item_id', 'order_line_item',
+            ['tenant_id', 'shopify_line_item_id'], unique=True,
+        )
+        op.create_index(
+            'ix_order_line_item_tenant_id_product_created_at', 'order_line_item',
+            ['tenant_id', 'shopify_product_id', 'created_at'], postgresql_include=['quantity', 'price'],
+        )
+
+    if not _has_table('sync_state'):
+        op.create_table(
+            'sync_state',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('tenant_id', sa.Integer(), nullable=False),
+            sa.Column('resource', sa.String(), nullable=False),
+            sa.Column('last_updated_at', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('last_synced_at', sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(['tenant_id'], ['tenant.id']),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('tenant_id', 'resource', name='uq_sync_state_tenant_id_resource'),
+        )
+        op.create_index('ix_sync_state_id', 'sync_state', ['id'])
+
+    if not _has_table('sync_run'):
+        op.create_table(
+            'sync_run',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('tenant_id', sa.Integer(), nullable=False),
+            sa.Column('trigger', sa.String(), nullable=True),
+            sa.Column('status', sa.String(), nullable=True),
+            sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('duration_seconds', sa.Float(), nullable=True),
+            sa.Column('pages', sa.Integer(), nullable=True),
+            sa.Column('rows_created', sa.Integer(), nullable=True),
+            sa.Column('rows_updated', sa.Integer(), nullable=True),
+            sa.Column('rows_unchanged', sa.Integer(), nullable=True),
+            sa.Column('rows_processed', sa.Integer(), nullable=True),
+            sa.Column('error', sa.Text(), nullable=True),
+            sa.ForeignKeyConstraint(['tenant_id'], ['tenant.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_sync_run_id', 'sync_run', ['id'])
+        op.create_index('ix_sync_run_tenant_id_finished_at', 'sync_run', ['tenant_id', 'finished_at'])
+    else:
+        _add_column('sync_run', sa.Column('rows_unchanged', sa.Integer(), nullable=True))
+
+    if not _has_table('tenant_daily_stats'):
+        op.create_table(
+            'tenant_daily_stats',
+            sa.Column('tenant_id', sa.Integer(), nullable=False),
+            sa.Column('day', sa.Date(), nullable=False),
+            sa.Column('currency', sa.String(), server_default='', nullable=False),
+            sa.Column('order_count', sa.Integer(), server_default='0', nullable=False),
+            sa.Column('revenue', sa.Float(), server_default='0', nullable=False),
+            sa.Column('distinct_buyers', sa.Integer(), server_default='0', nullable=False),
+            sa.Column('new_customers', sa.Integer(), server_default='0', nullable=False),
+            sa.ForeignKeyConstraint(['tenant_id'], ['tenant.id']),
+            sa.PrimaryKeyConstraint('tenant_id', 'day', 'currency'),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('tenant_daily_stats')
+    op.drop_table('sync_run')
+    op.drop_table('sync_state')
+    op.drop_table('order_line_item')
+    op.drop_column('order', 'customer_id')
+    op.drop_column('order', 'shopify_customer_id')
+    for table in ('product', 'order', 'customer'):
+        op.drop_column(table, 'content_hash')
+    op.drop_column('tenant', 'timezone')
@@ -0,0 +1,90 @@
+"""Tenant-scoped indexes; Shopify ids unique per tenant instead of globally
+
+Every ingest and dashboard query filters on tenant_id first, so the indexes
+lead with it:
+  - (tenant_id, shopify_*_id) unique keys, the conflict targets of bulk upserts
+  - (tenant_id, shopify_customer_id) and customer_id on orders, for linking
+    orders to customers
+  - (tenant_id, created_at) on orders and customers, for date-range scans
+    (hourly dashboard series, daily stats refreshes)
+  - (tenant_id, total_spent DESC) on customers, for top customers
+The global unique indexes on shopify_*_id are dropped: two stores can share
+an id, and they would reject the second tenant's row.
+
+Indexes are built and dropped CONCURRENTLY, so ingestion and the dashboard keep
+running during the upgrade. That cannot happen inside a transaction, hence the
+autocommit block. A failed concurrent build leaves an invalid index behind,
+which is dropped and rebuilt on the next attempt.
+
+Downgrading restores the global uniques, which fails if tenants already share
+Shopify ids.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, unique)
+TENANT_INDEXES = (
+    ('ix_product_tenant_id_shopify_product_id', 'product', 'tenant_id, shopify_product_id', True),
+    ('ix_customer_tenant_id_shopify_customer_id', 'customer', 'tenant_id, shopify_customer_id', True),
+    ('ix_order_tenant_id_shopify_order_id', '"order"', 'tenant_id, shopify_order_id', True),
+    ('ix_order_tenant_id_shopify_customer_id', '"order"', 'tenant_id, shopify_customer_id', False),
+    ('ix_order_customer_id', '"order"', 'customer_id', False),
+    ('ix_order_tenant_id_created_at', '"order"', 'tenant_id, created_at', False),
+    ('ix_customer_tenant_id_created_at', 'customer', 'tenant_id, created_at', False),
+    ('ix_customer_tenant_id_total_spent', 'customer', 'tenant_id, total_spent DESC', False),
+)
+
+# (name, table, column) of the global unique indexes this revision replaces
+GLOBAL_UNIQUES = (
+    ('ix_product_shopify_product_id', 'product', 'shopify_product_id'),
+    ('ix_customer_shopify_customer_id', 'customer', 'shopify_customer_id'),
+    ('ix_order_shopify_order_id', '"order"', 'shopify_order_id'),
+)
+
+
+def _drop_if_invalid(name: str):
+    """Drop an index left invalid by an interrupted CREATE INDEX CONCURRENTLY"""
+    if context.is_offline_mode():
+        return
+    invalid = op.get_bind().execute(sa.text(
+        "SELECT NOT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = :name AND c.relnamespace = current_schema()::regnamespace"
+    ), {"name": name}).scalar()
+    if invalid:
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+def _create_concurrently(name: str, table: str, columns: str, unique: bool):
+    _drop_if_invalid(name)
+    op.execute(f'CREATE {"UNIQUE " if unique else ""}INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})')
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in TENANT_INDEXES:
+            _create_concurrently(name, table, columns, unique)
+        # Only once the per-tenant keys exist, so upserts always have a conflict target
+        for name, _, _ in GLOBAL_UNIQUES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, column in GLOBAL_UNIQUES:
+            _create_concurrently(name, table, column, True)
+        for name, _, _, _ in TENANT_INDEXES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
@@ -0,0 +1,37 @@
+"""(tenant_id, created_at) on products, for keyset-paginated listings
+
+Orders and customers already have indexes for every listing sort key
+(revision 0003); products get theirs here. Built CONCURRENTLY like the others.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 09:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Left invalid by an interrupted build: drop and rebuild (see 0003)
+        if not context.is_offline_mode() and op.get_bind().execute(sa.text(
+            "SELECT NOT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = 'ix_product_tenant_id_created_at' AND c.relnamespace = current_schema()::regnamespace"
+        )).scalar():
+            op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_product_tenant_id_created_at')
+        op.execute('CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_product_tenant_id_created_at ON product (tenant_id, created_at)')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_product_tenant_id_created_at')
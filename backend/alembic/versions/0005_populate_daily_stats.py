@@ -0,0 +1,57 @@
+"""Populate tenant_daily_stats for tenants that predate it
+
+Revision 0002 creates the rollup empty, and it is only maintained as rows are
+written, so the dashboards of existing tenants would read zeros until a
+rebuild. This fills it for every tenant that has no rollup rows yet, the way
+daily_stats_service.rebuild does: calendar days in the tenant's timezone
+(UTC when unset or unknown). Tenants that already have rows are left alone.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 09:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Orders and customers are aggregated separately and merged into one row per (tenant, day, currency)
+    op.execute("""
+        WITH zones AS (
+            SELECT t.id AS tenant_id,
+                   CASE WHEN t.timezone IN (SELECT name FROM pg_timezone_names) THEN t.timezone ELSE 'UTC' END AS tz
+            FROM tenant t
+            WHERE NOT EXISTS (SELECT 1 FROM tenant_daily_stats s WHERE s.tenant_id = t.id)
+        )
+        INSERT INTO tenant_daily_stats (tenant_id, day, currency, order_count, revenue, distinct_buyers, new_customers)
+        SELECT tenant_id, day, currency, sum(order_count), sum(revenue), sum(distinct_buyers), sum(new_customers)
+        FROM (
+            SELECT z.tenant_id, CAST(timezone(z.tz, timezone('UTC', src.created_at)) AS date) AS day,
+                   coalesce(src.currency, '') AS currency, count(*) AS order_count,
+                   coalesce(sum(src.total_price), 0) AS revenue,
+                   count(DISTINCT src.shopify_customer_id) AS distinct_buyers, 0 AS new_customers
+            FROM "order" src JOIN zones z ON z.tenant_id = src.tenant_id
+            WHERE src.created_at IS NOT NULL
+            GROUP BY 1, 2, 3
+            UNION ALL
+            SELECT z.tenant_id, CAST(timezone(z.tz, timezone('UTC', src.created_at)) AS date), '', 0, 0, 0, count(*)
+            FROM customer src JOIN zones z ON z.tenant_id = src.tenant_id
+            WHERE src.created_at IS NOT NULL
+            GROUP BY 1, 2, 3
+        ) per_rollup
+        GROUP BY 1, 2, 3
+    """)
+
+
+def downgrade() -> None:
+    # Data only; the rows are what the application would have written anyway
+    pass
@@ -0,0 +1,32 @@
+"""tenant.data_version, the dashboard cache version shared by all processes
+
+Every ingest transaction increments it before committing, so API workers,
+the scheduler and webhook flushes in other processes all see each other's
+writes. Adding a column with a constant default does not rewrite the table.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 09:25:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # create_tables.py databases may already have it (see 0002)
+    if 'data_version' not in {column['name'] for column in sa.inspect(op.get_bind()).get_columns('tenant')}:
+        op.add_column('tenant', sa.Column('data_version', sa.BigInteger(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('tenant', 'data_version')
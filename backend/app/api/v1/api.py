@@ -1,9 +1,12 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import tenants, ingest, auth, dashboard
+from app.api.v1.endpoints import tenants, ingest, auth, dashboard, webhooks, export, listings
 
 api_router = APIRouter()
 api_router.include_router(tenants.router, prefix="/tenants", tags=["tenants"])
 api_router.include_router(ingest.router, prefix="/ingest", tags=["ingest"])
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
+api_router.include_router(webhooks.router, prefix="/webhooks", tags=["webhooks"])
+api_router.include_router(export.router, prefix="/export", tags=["export"])
+api_router.include_router(listings.router, tags=["listings"])
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models import user as user_model, customer as customer_model, order as order_model
+from app.models import user as user_model
 from app.api.v1.deps import get_current_user
 from app.db.session import SessionLocal
-from datetime import datetime, timedelta
+from app.core.metrics import DASHBOARD_CACHE_REQUESTS
+from app.services import dashboard_service
+from app.services.dashboard_cache import dashboard_cache, matches
+from datetime import datetime
 
 router = APIRouter()
 
@@ -17,40 +19,48 @@ def get_db():
 
 @router.get("/")
 def get_dashboard_data(
+    response: Response,
     db: Session = Depends(get_db),
     current_user: user_model.User = Depends(get_current_user),
     date_from: str = None,
-    date_to: str = None
+    date_to: str = None,
+    granularity: str = Query("day", pattern="^(hour|day|week|month)$"),
+    if_none_match: str = Header(None),
 ):
-    tenant_id = current_user.tenant_id
+    """
+    Dashboard KPIs for the current tenant
+    orders_over_time is bucketed by granularity in the shop's timezone, with empty buckets included
+    Responses are cached until the tenant's next ingest and carry an ETag; If-None-Match gets 304
+    """
+    tenant = current_user.tenant
+    tenant_id = tenant.id
+    # Read before the payload is computed, so the payload is never older than the version
+    version = tenant.data_version
+    # Private: the payload depends on who is asking. no-cache: browsers revalidate every poll
+    headers = {"Cache-Control": "private, no-cache"}
+    etag = dashboard_cache.etag(tenant_id, version)
+    if matches(if_none_match, etag):
+        DASHBOARD_CACHE_REQUESTS.labels("not_modified").inc()
+        return Response(status_code=304, headers={**headers, "ETag": etag})
 
-    total_customers = db.query(customer_model.Customer).filter(customer_model.Customer.tenant_id == tenant_id).count()
-    total_orders = db.query(order_model.Order).filter(order_model.Order.tenant_id == tenant_id).count()
-    total_revenue = db.query(order_model.Order).filter(order_model.Order.tenant_id == tenant_id).with_entities(order_model.Order.total_price).all()
-    total_revenue = sum(price for price, in total_revenue)
-
-    orders_query = db.query(order_model.Order).filter(order_model.Order.tenant_id == tenant_id)
-    if date_from:
-        orders_query = orders_query.filter(order_model.Order.created_at >= datetime.fromisoformat(date_from))
-    if date_to:
-        orders_query = orders_query.filter(order_model.Order.created_at <= datetime.fromisoformat(date_to))
-    
-    orders_over_time = orders_query.group_by(order_model.Order.created_at).with_entities(order_model.Order.created_at, func.count(order_model.Order.id)).all()
-    orders_over_time_labels = [str(o[0].date()) for o in orders_over_time]
-    orders_over_time_values = [o[1] for o in orders_over_time]
-
-    top_customers = db.query(customer_model.Customer).filter(customer_model.Customer.tenant_id == tenant_id).order_by(customer_model.Customer.total_spent.desc()).limit(5).all()
-
-    return {
-        "total_customers": total_customers,
-        "total_orders": total_orders,
-        "total_revenue": total_revenue,
-        "orders_over_time": {
-            "labels": orders_over_time_labels,
-            "values": orders_over_time_values
-        },
-        "top_customers": [
-            {"first_name": c.first_name, "last_name": c.last_name, "total_spent": c.total_spent}
-            for c in top_customers
-        ]
-    }
+    try:
+        parsed_from = datetime.fromisoformat(date_from) if date_from else None
+        parsed_to = datetime.fromisoformat(date_to) if date_to else None
+        etag, payload, hit = dashboard_cache.get(
+            tenant_id,
+            version,
+            (parsed_from, parsed_to, granularity),
+            lambda: dashboard_service.get_dashboard_data(
+                db,
+                tenant_id,
+                date_from=parsed_from,
+                date_to=parsed_to,
+                granularity=granularity,
+                tz_name=tenant.timezone,
+            ),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    DASHBOARD_CACHE_REQUESTS.labels("hit" if hit else "miss").inc()
+    response.headers.update({**headers, "ETag": etag})
+    return payload
@@ -0,0 +1,41 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.models import user as user_model
+from app.api.v1.deps import get_current_user
+from app.services import export_service
+from app.services.dashboard_service import to_utc, shop_timezone
+
+router = APIRouter()
+
+@router.get("/{resource}")
+def export_resource(
+    resource: str,
+    format: str = Query("csv", pattern="^(csv|ndjson|parquet)$"),
+    date_from: str = None,
+    date_to: str = None,
+    current_user: user_model.User = Depends(get_current_user)
+):
+    """
+    Stream all of the current tenant's orders, customers or products as CSV, NDJSON or Parquet
+    date_from/date_to filter on created_at, inclusive; shop-local unless they carry an offset
+    """
+    if resource not in export_service.EXPORTS:
+        raise HTTPException(status_code=404, detail=f"Unknown resource: {resource}")
+    try:
+        tz_name = shop_timezone(current_user.tenant.timezone)
+        body = export_service.stream(
+            current_user.tenant_id,
+            resource,
+            format,
+            date_from=to_utc(datetime.fromisoformat(date_from), tz_name) if date_from else None,
+            date_to=to_utc(datetime.fromisoformat(date_to), tz_name) if date_to else None,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    media_type, extension = export_service.FORMATS[format]
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{resource}.{extension}"'},
+    )
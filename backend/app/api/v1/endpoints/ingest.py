@@ -1,6 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from app.models import user as user_model
+from starlette.concurrency import run_in_threadpool
+from app.models import user as user_model, sync_run as sync_run_model
+from app.schemas import ingestion_job as ingestion_job_schema, sync_run as sync_run_schema
+from app.services.ingestion_jobs import job_manager
+from app.services import tenant_service
 from app.services.ingestion_service import IngestionService
 from app.db.session import SessionLocal
 from app.api.v1.deps import get_current_user
@@ -16,40 +21,64 @@ def get_db():
 
 @router.post("/shopify/products")
 def ingest_products(
+    full_resync: bool = False,
     db: Session = Depends(get_db),
     current_user: user_model.User = Depends(get_current_user)
 ):
     """
     Ingest products from Shopify API for the current tenant
+    Incremental by default; pass full_resync=true to re-pull the complete history
     """
     ingestion_service = IngestionService(db, current_user.tenant)
-    result = ingestion_service.ingest_products()
+    result = ingestion_service.ingest_products(full_resync=full_resync)
     return result
 
 @router.post("/shopify/orders")
 def ingest_orders(
+    full_resync: bool = False,
     db: Session = Depends(get_db),
     current_user: user_model.User = Depends(get_current_user)
 ):
     """
     Ingest orders from Shopify API for the current tenant
+    Incremental by default; pass full_resync=true to re-pull the complete history
     """
     ingestion_service = IngestionService(db, current_user.tenant)
-    result = ingestion_service.ingest_orders()
+    result = ingestion_service.ingest_orders(full_resync=full_resync)
     return result
 
 @router.post("/shopify/customers")
 def ingest_customers(
+    full_resync: bool = False,
     db: Session = Depends(get_db),
     current_user: user_model.User = Depends(get_current_user)
 ):
     """
     Ingest customers from Shopify API for the current tenant
+    Incremental by default; pass full_resync=true to re-pull the complete history
     """
     ingestion_service = IngestionService(db, current_user.tenant)
-    result = ingestion_service.ingest_customers()
+    result = ingestion_service.ingest_customers(full_resync=full_resync)
     return result
 
+@router.post("/shopify/all")
+async def ingest_all(
+    full_resync: bool = False,
+    db: Session = Depends(get_db),
+    current_user: user_model.User = Depends(get_current_user)
+):
+    """
+    Ingest products, orders and customers concurrently for the current tenant
+    Fetching runs on the event loop, so no threadpool worker waits on Shopify
+    """
+    # Loaded off the event loop, and in the session the service commits
+    tenant = await run_in_threadpool(tenant_service.get_tenant, db, current_user.tenant_id)
+    ingestion_service = IngestionService(db, tenant)
+    try:
+        return await ingestion_service.ingest_all(full_resync=full_resync)
+    finally:
+        ingestion_service.close()
+
 @router.get("/shopify/test-connection")
 def test_shopify_connection(
     db: Session = Depends(get_db),
@@ -61,3 +90,53 @@ def test_shopify_connection(
     ingestion_service = IngestionService(db, current_user.tenant)
     result = ingestion_service.test_connection()
     return result
+
+@router.post("/jobs", response_model=ingestion_job_schema.IngestionJob, status_code=202)
+def submit_ingestion_job(
+    job_in: ingestion_job_schema.IngestionJobCreate,
+    current_user: user_model.User = Depends(get_current_user)
+):
+    """
+    Queue an ingestion run for the current tenant and return its job ID immediately
+    Poll GET /ingest/jobs/{job_id} for progress
+    """
+    job = job_manager.submit(current_user.tenant_id, job_in.resources, full_resync=job_in.full_resync)
+    return job.to_dict()
+
+@router.post("/shopify/bulk", response_model=ingestion_job_schema.IngestionJob, status_code=202)
+def submit_bulk_import(
+    bulk_in: ingestion_job_schema.BulkImportCreate,
+    current_user: user_model.User = Depends(get_current_user)
+):
+    """
+    Import a Shopify Bulk Operation JSONL export for the current tenant as a background job
+    The export is streamed line by line into the same upsert path as regular ingestion
+    """
+    job = job_manager.submit(current_user.tenant_id, [bulk_in.resource], bulk_source=bulk_in.url)
+    return job.to_dict()
+
+@router.get("/jobs/{job_id}", response_model=ingestion_job_schema.IngestionJob)
+def get_ingestion_job(
+    job_id: str,
+    current_user: user_model.User = Depends(get_current_user)
+):
+    """
+    Report progress of a background ingestion job: pages fetched, rows written, rows/sec and errors
+    """
+    job = job_manager.get(job_id)
+    if job is None or job.tenant_id != current_user.tenant_id:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+    return job.to_dict()
+
+@router.get("/sync-runs", response_model=List[sync_run_schema.SyncRun])
+def list_sync_runs(
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: user_model.User = Depends(get_current_user)
+):
+    """
+    Most recent scheduled sync runs for the current tenant with duration and row counts
+    """
+    return db.query(sync_run_model.SyncRun).filter(
+        sync_run_model.SyncRun.tenant_id == current_user.tenant_id
+    ).order_by(sync_run_model.SyncRun.finished_at.desc()).limit(limit).all()
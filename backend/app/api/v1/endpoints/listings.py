@@ -0,0 +1,97 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.models import user as user_model
+from app.schemas import customer as customer_schema, order as order_schema, product as product_schema
+from app.schemas.page import Page
+from app.api.v1.deps import get_current_user
+from app.db.session import SessionLocal
+from app.services import listing_service
+from app.services.dashboard_service import to_utc, shop_timezone
+
+router = APIRouter()
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def _page(db: Session, user: user_model.User, resource: str, sort: str, order: str, cursor: str, limit: int,
+          date_from: str, date_to: str, filters: dict):
+    """listing_service.list_page for the user's tenant; date bounds are shop-local unless they carry an offset"""
+    try:
+        tz_name = shop_timezone(user.tenant.timezone)
+        return listing_service.list_page(
+            db,
+            user.tenant_id,
+            resource,
+            sort=sort,
+            descending=order == "desc",
+            cursor=cursor,
+            limit=limit,
+            date_from=to_utc(datetime.fromisoformat(date_from), tz_name) if date_from else None,
+            date_to=to_utc(datetime.fromisoformat(date_to), tz_name) if date_to else None,
+            filters=filters,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/orders/", response_model=Page[order_schema.Order])
+def list_orders(
+    sort: str = Query("created_at", pattern="^created_at$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    cursor: str = None,
+    limit: int = Query(50, ge=1, le=listing_service.MAX_PAGE_SIZE),
+    date_from: str = None,
+    date_to: str = None,
+    currency: str = None,
+    shopify_customer_id: str = None,
+    db: Session = Depends(get_db),
+    current_user: user_model.User = Depends(get_current_user)
+):
+    """
+    Page through the current tenant's orders, newest first by default
+    Pass the returned next_cursor as cursor= (with the same sort and order) for the next page
+    """
+    return _page(db, current_user, "orders", sort, order, cursor, limit, date_from, date_to,
+                 {"currency": currency, "shopify_customer_id": shopify_customer_id})
+
+@router.get("/customers/", response_model=Page[customer_schema.Customer])
+def list_customers(
+    sort: str = Query("total_spent", pattern="^(total_spent|created_at)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    cursor: str = None,
+    limit: int = Query(50, ge=1, le=listing_service.MAX_PAGE_SIZE),
+    date_from: str = None,
+    date_to: str = None,
+    email: str = None,
+    db: Session = Depends(get_db),
+    current_user: user_model.User = Depends(get_current_user)
+):
+    """
+    Page through the current tenant's customers, biggest spenders first by default
+    Pass the returned next_cursor as cursor= (with the same sort and order) for the next page
+    """
+    return _page(db, current_user, "customers", sort, order, cursor, limit, date_from, date_to, {"email": email})
+
+@router.get("/products/", response_model=Page[product_schema.Product])
+def list_products(
+    sort: str = Query("created_at", pattern="^created_at$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    cursor: str = None,
+    limit: int = Query(50, ge=1, le=listing_service.MAX_PAGE_SIZE),
+    date_from: str = None,
+    date_to: str = None,
+    vendor: str = None,
+    product_type: str = None,
+    db: Session = Depends(get_db),
+    current_user: user_model.User = Depends(get_current_user)
+):
+    """
+    Page through the current tenant's products, newest first by default
+    Pass the returned next_cursor as cursor= (with the same sort and order) for the next page
+    """
+    return _page(db, current_user, "products", sort, order, cursor, limit, date_from, date_to,
+                 {"vendor": vendor, "product_type": product_type})
@@ -0,0 +1,67 @@
+import json
+from typing import Dict
+from fastapi import APIRouter, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+from app.core.security import shopify_webhook_secret_configured, verify_shopify_webhook
+from app.db.session import SessionLocal
+from app.services import tenant_service
+from app.services.webhook_buffer import WEBHOOK_TOPICS, WebhookBufferFull, webhook_buffer
+
+router = APIRouter()
+
+# Shop domain -> tenant id; webhook bursts should not cost a tenant lookup per event
+_tenant_ids: Dict[str, int] = {}
+
+def _lookup_tenant_id(shop_domain: str):
+    tenant_id = _tenant_ids.get(shop_domain)
+    if tenant_id is None:
+        db = SessionLocal()
+        try:
+            tenant = tenant_service.get_tenant_by_shopify_store_url(db, shopify_store_url=shop_domain)
+        finally:
+            db.close()
+        if tenant is None:
+            return None
+        tenant_id = _tenant_ids[shop_domain] = tenant.id
+    return tenant_id
+
+@router.post("/shopify/{resource}/{event}")
+async def receive_shopify_webhook(resource: str, event: str, request: Request):
+    """
+    Receive a Shopify webhook (orders/create, orders/updated, customers/create,
+    customers/update, products/create, products/update, products/delete)
+    The event is verified and buffered; it reaches the database in the next micro-batch
+    """
+    topic = f"{resource}/{event}"
+    if topic not in WEBHOOK_TOPICS:
+        raise HTTPException(status_code=404, detail=f"Unsupported webhook topic: {topic}")
+
+    if not shopify_webhook_secret_configured():
+        # Signatures cannot be checked against a publicly known key; Shopify retries 5xx deliveries
+        raise HTTPException(status_code=503, detail="Webhooks are disabled until SHOPIFY_API_SECRET is set")
+
+    body = await request.body()
+    if not verify_shopify_webhook(body, request.headers.get("X-Shopify-Hmac-Sha256")):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+
+    header_topic = request.headers.get("X-Shopify-Topic")
+    if header_topic and header_topic != topic:
+        raise HTTPException(status_code=400, detail=f"Topic header {header_topic} does not match {topic}")
+
+    shop_domain = request.headers.get("X-Shopify-Shop-Domain")
+    if not shop_domain:
+        raise HTTPException(status_code=400, detail="Missing X-Shopify-Shop-Domain header")
+    tenant_id = await run_in_threadpool(_lookup_tenant_id, shop_domain)
+    if tenant_id is None:
+        raise HTTPException(status_code=404, detail="Unknown shop")
+
+    try:
+        payload = json.loads(body)
+        webhook_buffer.add(tenant_id, topic, payload)
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid webhook payload")
+    except WebhookBufferFull:
+        # Shopify retries non-2xx deliveries, so shedding load here loses nothing
+        raise HTTPException(status_code=503, detail="Webhook buffer full, retry later")
+
+    return {"status": "accepted"}
@@ -14,6 +14,50 @@ class Settings(BaseSettings):
     SHOPIFY_API_KEY: str = "your_shopify_api_key"
     SHOPIFY_API_SECRET: str = "your_shopify_api_secret"
     SHOPIFY_API_VERSION: str = "2023-10"
+    SHOPIFY_API_SCHEME: str = "https"  # "http" to point tenants at a local stand-in (benchmarks/shopify_standin.py)
+    SHOPIFY_MAX_RETRIES: int = 5  # Retries for 429, 5xx and timeouts
+    SHOPIFY_BACKOFF_BASE_SECONDS: float = 0.5
+    SHOPIFY_BACKOFF_MAX_SECONDS: float = 30.0
+    SHOPIFY_BUCKET_HEADROOM: int = 2  # Call-limit slots left free for other apps
+
+    # Mock mode data: "fixtures" (a small random sample) or "synthetic" (a seeded, paginated store)
+    MOCK_DATA_SOURCE: str = "fixtures"
+    SYNTHETIC_SEED: int = 42  # Offset by tenant id, so each tenant gets its own store
+    SYNTHETIC_PRODUCTS: int = 500
+    SYNTHETIC_CUSTOMERS: int = 5000
+    SYNTHETIC_ORDERS: int = 50000
+    SYNTHETIC_DAYS: int = 365  # Order history window, ending at midnight UTC today
+
+    # Ingestion Configuration
+    INGEST_BATCH_SIZE: int = 1000  # Rows per INSERT ... ON CONFLICT statement
+    INGEST_WORKER_CONCURRENCY: int = 4  # Background ingestion jobs running at once
+    INGEST_JOB_HISTORY_SIZE: int = 1000  # Finished jobs kept for status polling
+    BULK_IMPORT_TIMEOUT_SECONDS: int = 60  # Connect/read timeout when streaming a bulk export
+    # Where POST /ingest/shopify/bulk may fetch exports from: Shopify's bulk-operation storage
+    BULK_IMPORT_URL_PREFIXES: list = ["https://storage.googleapis.com/shopify-tiers-assets-prod-us-east1/"]
+
+    # Raw payload archive for offline replay
+    PAYLOAD_ARCHIVE_ENABLED: bool = False
+    PAYLOAD_ARCHIVE_DIR: str = "payload_archive"
+    PAYLOAD_ARCHIVE_COMPRESSLEVEL: int = 6
+
+    # Fleet-wide scheduled sync (run the scheduler in a single process only)
+    SYNC_SCHEDULER_ENABLED: bool = False
+    SYNC_INTERVAL_SECONDS: int = 3600
+    SYNC_MAX_CONCURRENCY: int = 4  # Resource syncs running at once across all tenants
+    SYNC_PER_STORE_CONCURRENCY: int = 1  # Resource syncs running at once against one store
+    SYNC_WATERMARK_SKEW_SECONDS: int = 300  # The watermark never passes a run's start time less this
+
+    # Webhook micro-batching
+    WEBHOOK_FLUSH_MAX_EVENTS: int = 500  # Flush as soon as this many events are buffered
+    WEBHOOK_FLUSH_INTERVAL_SECONDS: float = 2.0  # ...or after this long, whichever comes first
+    WEBHOOK_BUFFER_MAX_EVENTS: int = 50000  # Beyond this, webhooks get 503 and Shopify retries
+
+    # Dashboard response cache (payloads per process, versions in the database; see dashboard_cache)
+    DASHBOARD_CACHE_MAX_ENTRIES: int = 1024  # Least recently used responses are evicted beyond this
+
+    # Bulk export
+    EXPORT_BATCH_SIZE: int = 5000  # Rows fetched from the server-side cursor and encoded at a time
     
     BACKEND_CORS_ORIGINS: list = ["http://localhost:3000", "http://localhost:3001"]
 
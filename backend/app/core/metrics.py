@@ -0,0 +1,74 @@
+"""
+Prometheus metrics
+Ingestion is broken down per tenant and resource into stages:
+  fetch     - waiting on Shopify for a page (excluding rate-limit pacing)
+  decode    - parsing the response body
+  transform - building rows from records
+  db_write  - upserts and follow-up statements for a page
+so a slow sync shows where its time went. Metrics live in the process-wide
+default registry and are served by GET /metrics; with several worker
+processes each one exposes its own counters.
+"""
+
+import time
+from contextlib import contextmanager
+from prometheus_client import Counter, Gauge, Histogram
+
+# Shopify pages take from milliseconds (decode) to tens of seconds (throttled fetches)
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+INGEST_STAGE_SECONDS = Histogram(
+    "ingest_stage_seconds",
+    "Time spent per ingestion stage and page",
+    ["tenant_id", "resource", "stage"],
+    buckets=STAGE_BUCKETS,
+)
+INGEST_ROWS = Counter(
+    "ingest_rows_total",
+    "Ingested rows by outcome (created, updated, unchanged)",
+    ["tenant_id", "resource", "outcome"],
+)
+INGEST_ROWS_PER_SECOND = Gauge(
+    "ingest_rows_per_second",
+    "Throughput of the last completed ingest run",
+    ["tenant_id", "resource"],
+)
+SHOPIFY_RETRIES = Counter(
+    "shopify_request_retries_total",
+    "Shopify requests retried, by reason (status code, timeout or connection)",
+    ["tenant_id", "resource", "reason"],
+)
+SHOPIFY_RATE_LIMIT_WAIT_SECONDS = Counter(
+    "shopify_rate_limit_wait_seconds_total",
+    "Time spent waiting on the store's leaky bucket or a Retry-After",
+    ["tenant_id", "resource"],
+)
+DASHBOARD_CACHE_REQUESTS = Counter(
+    "dashboard_cache_requests_total",
+    "Dashboard requests by cache outcome (hit, miss, not_modified)",
+    ["outcome"],
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "API request latency by route template",
+    ["method", "route", "status"],
+)
+
+
+@contextmanager
+def stage_timer(tenant_id: int, resource: str, stage: str):
+    """Observe the duration of the enclosed block as one sample of an ingestion stage"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        INGEST_STAGE_SECONDS.labels(str(tenant_id), resource, stage).observe(time.perf_counter() - started)
+
+
+def record_rate_limit_wait(tenant_id: int, resource: str, seconds: float):
+    if seconds > 0:
+        SHOPIFY_RATE_LIMIT_WAIT_SECONDS.labels(str(tenant_id), resource).inc(seconds)
+
+
+def record_retry(tenant_id: int, resource: str, reason: str):
+    SHOPIFY_RETRIES.labels(str(tenant_id), resource, reason).inc()
@@ -1,3 +1,6 @@
+import base64
+import hashlib
+import hmac
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
@@ -28,6 +31,22 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+# Values shipped in .env.example and the docs: anyone could sign webhooks with them
+PLACEHOLDER_SHOPIFY_API_SECRETS = {"", "your_shopify_api_secret", "your_app_secret"}
+
+def shopify_webhook_secret_configured() -> bool:
+    return settings.SHOPIFY_API_SECRET not in PLACEHOLDER_SHOPIFY_API_SECRETS
+
+def verify_shopify_webhook(body: bytes, hmac_header: Optional[str]) -> bool:
+    """
+    Check X-Shopify-Hmac-Sha256: base64 HMAC-SHA256 of the raw request body keyed with the app secret
+    Always False while the secret is unset or still a placeholder
+    """
+    if not hmac_header or not shopify_webhook_secret_configured():
+        return False
+    digest = hmac.new(settings.SHOPIFY_API_SECRET.encode("utf-8"), body, hashlib.sha256).digest()
+    return hmac.compare_digest(base64.b64encode(digest).decode("utf-8"), hmac_header)
+
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
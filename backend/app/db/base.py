@@ -3,4 +3,8 @@ from app.models.tenant import Tenant  # noqa
 from app.models.user import User  # noqa
 from app.models.product import Product  # noqa
 from app.models.order import Order  # noqa
+from app.models.order_line_item import OrderLineItem  # noqa
 from app.models.customer import Customer  # noqa
+from app.models.sync_state import SyncState  # noqa
+from app.models.sync_run import SyncRun  # noqa
+from app.models.tenant_daily_stats import TenantDailyStats  # noqa
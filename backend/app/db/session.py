@@ -24,3 +24,22 @@ def ensure_schema_exists():
         with engine.connect() as connection:
             connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {settings.DATABASE_SCHEMA}"))
             connection.commit()
+
+# Conflict targets of the ingest upserts (app/services/bulk_upsert.py), as (name, table, columns)
+CONFLICT_INDEXES = (
+    ("ix_product_tenant_id_shopify_product_id", "product", "tenant_id, shopify_product_id"),
+    ("ix_customer_tenant_id_shopify_customer_id", "customer", "tenant_id, shopify_customer_id"),
+    ("ix_order_tenant_id_shopify_order_id", '"order"', "tenant_id, shopify_order_id"),
+)
+
+def ensure_conflict_indexes():
+    """
+    Create the (tenant_id, shopify_*_id) unique indexes upserts conflict on, if missing.
+    create_all() only adds indexes with new tables, so databases set up with
+    create_tables.py before these indexes existed would otherwise reject every
+    upsert. Idempotent; Alembic-managed databases get them from revision 0003.
+    """
+    with engine.connect() as connection:
+        for name, table, columns in CONFLICT_INDEXES:
+            connection.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+        connection.commit()
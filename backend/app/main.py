@@ -1,8 +1,16 @@
-from fastapi import FastAPI
+import time
+from fastapi import FastAPI, Request, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.core.metrics import HTTP_REQUEST_SECONDS
+from app.services.ingestion_jobs import job_manager
+from app.services.shopify_async_client import close_store_clients
+from app.services.sync_scheduler import sync_scheduler
+from app.services.webhook_buffer import webhook_buffer
 
 app = FastAPI(
     title=settings.PROJECT_NAME, openapi_url=f"{settings.API_V1_STR}/openapi.json"
@@ -20,6 +28,39 @@ if settings.BACKEND_CORS_ORIGINS:
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template (/jobs/{job_id}), not the raw path, to keep cardinality bounded
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.labels(
+            request.method, route.path if route is not None else "unmatched", str(status)
+        ).observe(time.perf_counter() - started)
+
+@app.on_event("startup")
+def startup():
+    webhook_buffer.start()
+    if settings.SYNC_SCHEDULER_ENABLED:
+        sync_scheduler.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    sync_scheduler.stop()
+    job_manager.shutdown()
+    # Final flush of buffered webhooks runs off the event loop
+    await run_in_threadpool(webhook_buffer.stop)
+    await close_store_clients()
+
 @app.get("/health")
 def health_check():
     return {"status": "healthy", "service": "xeno-shopify-api"}
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
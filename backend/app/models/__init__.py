@@ -1,5 +1,9 @@
 from .customer import Customer
 from .order import Order
+from .order_line_item import OrderLineItem
 from .product import Product
 from .tenant import Tenant
 from .user import User
+from .sync_state import SyncState
+from .sync_run import SyncRun
+from .tenant_daily_stats import TenantDailyStats
@@ -1,15 +1,26 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, BigInteger, String, Float, ForeignKey, DateTime, Index, text
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 import datetime
 
 class Customer(Base):
+    __table_args__ = (
+        # Conflict target for bulk upserts during ingestion
+        Index("ix_customer_tenant_id_shopify_customer_id", "tenant_id", "shopify_customer_id", unique=True),
+        # Top customers by spend, read in index order
+        Index("ix_customer_tenant_id_total_spent", "tenant_id", text("total_spent DESC")),
+        # Daily stats refreshes read customers by creation date
+        Index("ix_customer_tenant_id_created_at", "tenant_id", "created_at"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
-    shopify_customer_id = Column(String, unique=True, index=True)
+    shopify_customer_id = Column(String)  # Unique per tenant only, see __table_args__
     first_name = Column(String)
     last_name = Column(String)
     email = Column(String)
     total_spent = Column(Float)
     created_at = Column(DateTime)
+    orders = relationship("Order", back_populates="customer")
+    content_hash = Column(BigInteger)  # Hash of the ingested fields, see bulk_upsert
     tenant_id = Column(Integer, ForeignKey("tenant.id"))
     tenant = relationship("Tenant", back_populates="customers")
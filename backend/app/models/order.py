@@ -1,13 +1,27 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, BigInteger, String, Float, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 import datetime
 
 class Order(Base):
+    __table_args__ = (
+        # Conflict target for bulk upserts during ingestion
+        Index("ix_order_tenant_id_shopify_order_id", "tenant_id", "shopify_order_id", unique=True),
+        # Links orders to customers that are ingested after them
+        Index("ix_order_tenant_id_shopify_customer_id", "tenant_id", "shopify_customer_id"),
+        # Date-range scans: hourly dashboard series and daily stats refreshes
+        Index("ix_order_tenant_id_created_at", "tenant_id", "created_at"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
-    shopify_order_id = Column(String, unique=True, index=True)
+    shopify_order_id = Column(String)  # Unique per tenant only, see __table_args__
     total_price = Column(Float)
     currency = Column(String)
     created_at = Column(DateTime)
+    shopify_customer_id = Column(String)
+    customer_id = Column(Integer, ForeignKey("customer.id", ondelete="SET NULL"), index=True)
+    customer = relationship("Customer", back_populates="orders")
+    line_items = relationship("OrderLineItem", back_populates="order", passive_deletes=True)
+    content_hash = Column(BigInteger)  # Hash of the ingested fields, see bulk_upsert
     tenant_id = Column(Integer, ForeignKey("tenant.id"))
     tenant = relationship("Tenant", back_populates="orders")
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, BigInteger, String, Float, ForeignKey, DateTime, Index
+from sqlalchemy.orm import relationship
+from app.db.base_class import Base
+
+class OrderLineItem(Base):
+    __tablename__ = "order_line_item"
+    __table_args__ = (
+        # Conflict target for bulk upserts during ingestion
+        Index("ix_order_line_item_tenant_id_shopify_line_item_id", "tenant_id", "shopify_line_item_id", unique=True),
+        # Revenue by product over time: the index alone answers the aggregate
+        Index(
+            "ix_order_line_item_tenant_id_product_created_at",
+            "tenant_id", "shopify_product_id", "created_at",
+            postgresql_include=["quantity", "price"],
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    shopify_line_item_id = Column(String, nullable=False)
+    shopify_order_id = Column(String, nullable=False)
+    shopify_product_id = Column(String)
+    shopify_variant_id = Column(String)
+    title = Column(String)
+    sku = Column(String)
+    quantity = Column(Integer)
+    price = Column(Float)  # Unit price before discounts
+    created_at = Column(DateTime)  # Copied from the order so time-bucketed queries skip the join
+    order_id = Column(Integer, ForeignKey("order.id", ondelete="CASCADE"), index=True)
+    order = relationship("Order", back_populates="line_items")
+    content_hash = Column(BigInteger)  # Hash of the ingested fields, see bulk_upsert
+    tenant_id = Column(Integer, ForeignKey("tenant.id"), nullable=False)
@@ -1,14 +1,22 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, BigInteger, String, Float, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 import datetime
 
 class Product(Base):
+    __table_args__ = (
+        # Conflict target for bulk upserts during ingestion
+        Index("ix_product_tenant_id_shopify_product_id", "tenant_id", "shopify_product_id", unique=True),
+        # Keyset-paginated product listings
+        Index("ix_product_tenant_id_created_at", "tenant_id", "created_at"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
-    shopify_product_id = Column(String, unique=True, index=True)
+    shopify_product_id = Column(String)  # Unique per tenant only, see __table_args__
     title = Column(String)
     vendor = Column(String)
     product_type = Column(String)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    content_hash = Column(BigInteger)  # Hash of the ingested fields, see bulk_upsert
     tenant_id = Column(Integer, ForeignKey("tenant.id"))
     tenant = relationship("Tenant", back_populates="products")
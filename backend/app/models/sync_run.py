@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Text, Index
+from app.db.base_class import Base
+
+class SyncRun(Base):
+    __tablename__ = "sync_run"
+    __table_args__ = (
+        Index("ix_sync_run_tenant_id_finished_at", "tenant_id", "finished_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenant.id"), nullable=False)
+    trigger = Column(String, default="scheduler")
+    status = Column(String)  # "succeeded", "partial" or "failed"
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    duration_seconds = Column(Float)
+    pages = Column(Integer, default=0)
+    rows_created = Column(Integer, default=0)
+    rows_updated = Column(Integer, default=0)
+    rows_unchanged = Column(Integer, default=0)
+    rows_processed = Column(Integer, default=0)
+    error = Column(Text)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, UniqueConstraint
+from app.db.base_class import Base
+
+class SyncState(Base):
+    __tablename__ = "sync_state"
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "resource", name="uq_sync_state_tenant_id_resource"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenant.id"), nullable=False)
+    resource = Column(String, nullable=False)  # "products", "orders" or "customers"
+    # Highest Shopify updated_at seen by the last successful sync (UTC)
+    last_updated_at = Column(DateTime(timezone=True))
+    last_synced_at = Column(DateTime(timezone=True))
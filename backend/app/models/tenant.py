@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 import datetime
@@ -8,6 +8,8 @@ class Tenant(Base):
     name = Column(String, index=True)
     shopify_store_url = Column(String, unique=True, index=True)
     shopify_access_token = Column(String)
+    timezone = Column(String, default="UTC", server_default="UTC")  # Shop's IANA timezone, for dashboard buckets
+    data_version = Column(BigInteger, nullable=False, default=0, server_default="0")  # Bumped by every ingest commit; dashboard cache key
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     users = relationship("User", back_populates="tenant")
     products = relationship("Product", back_populates="tenant")
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date
+from app.db.base_class import Base
+
+# Per-day rollup of a tenant's orders and customers, maintained by daily_stats_service
+class TenantDailyStats(Base):
+    __tablename__ = "tenant_daily_stats"
+
+    tenant_id = Column(Integer, ForeignKey("tenant.id"), primary_key=True)
+    day = Column(Date, primary_key=True)  # Calendar day in the tenant's timezone
+    # Order metrics are split by currency; new_customers has none and lives on the "" row
+    currency = Column(String, primary_key=True, default="", server_default="")
+    order_count = Column(Integer, nullable=False, default=0, server_default="0")
+    revenue = Column(Float, nullable=False, default=0, server_default="0")
+    distinct_buyers = Column(Integer, nullable=False, default=0, server_default="0")
+    new_customers = Column(Integer, nullable=False, default=0, server_default="0")
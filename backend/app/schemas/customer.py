@@ -1,11 +1,12 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Optional
 
 class CustomerBase(BaseModel):
     shopify_customer_id: str
-    first_name: str
-    last_name: str
-    email: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[str] = None
     total_spent: float
 
 class CustomerCreate(CustomerBase):
@@ -15,7 +16,7 @@ class CustomerCreate(CustomerBase):
 class Customer(CustomerBase):
     id: int
     tenant_id: int
-    created_at: datetime
+    created_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
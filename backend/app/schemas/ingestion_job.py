@@ -0,0 +1,59 @@
+from pydantic import BaseModel, field_validator
+from datetime import datetime
+from typing import Dict, List, Optional
+from app.core.config import settings
+
+INGEST_RESOURCES = ["products", "orders", "customers"]
+
+class IngestionJobCreate(BaseModel):
+    resources: List[str] = INGEST_RESOURCES
+    full_resync: bool = False
+
+    @field_validator("resources")
+    @classmethod
+    def validate_resources(cls, resources):
+        unknown = [resource for resource in resources if resource not in INGEST_RESOURCES]
+        if unknown:
+            raise ValueError(f"Unknown resources: {', '.join(unknown)}")
+        if not resources:
+            raise ValueError("At least one resource is required")
+        # Keep the caller's order but drop duplicates
+        return list(dict.fromkeys(resources))
+
+class BulkImportCreate(BaseModel):
+    resource: str
+    url: str  # Signed URL of a completed bulk operation (its "url" field)
+
+    @field_validator("resource")
+    @classmethod
+    def validate_resource(cls, resource):
+        if resource not in INGEST_RESOURCES:
+            raise ValueError(f"Unknown resource: {resource}")
+        return resource
+
+    @field_validator("url")
+    @classmethod
+    def validate_url(cls, url):
+        # The server fetches this URL, so over HTTP it may only point at Shopify's bulk-operation
+        # storage; local paths and other hosts are for the bulk_import.py command
+        allowed = any(url.startswith(prefix) for prefix in settings.BULK_IMPORT_URL_PREFIXES)
+        if not allowed or ".." in url or "\\" in url:
+            raise ValueError("url must be the url of a completed Shopify bulk operation")
+        return url
+
+class IngestionJob(BaseModel):
+    id: str
+    status: str
+    resources: List[str]
+    full_resync: bool
+    bulk_source: Optional[str] = None
+    current_resource: Optional[str] = None
+    submitted_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    elapsed_seconds: float
+    pages_fetched: int
+    rows_written: int
+    rows_per_sec: float
+    errors: List[str]
+    results: Dict[str, dict]
@@ -1,11 +1,13 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Optional
 
 class OrderBase(BaseModel):
     shopify_order_id: str
     total_price: float
-    currency: str
+    currency: Optional[str] = None
     created_at: datetime
+    shopify_customer_id: Optional[str] = None
 
 class OrderCreate(OrderBase):
     tenant_id: int
@@ -1,11 +1,12 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Optional
 
 class ProductBase(BaseModel):
     shopify_product_id: str
-    title: str
-    vendor: str
-    product_type: str
+    title: Optional[str] = None
+    vendor: Optional[str] = None
+    product_type: Optional[str] = None
 
 class ProductCreate(ProductBase):
     tenant_id: int
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+class SyncRun(BaseModel):
+    id: int
+    tenant_id: int
+    trigger: str
+    status: str
+    started_at: datetime
+    finished_at: datetime
+    duration_seconds: float
+    pages: int
+    rows_created: int
+    rows_updated: int
+    rows_unchanged: Optional[int] = None
+    rows_processed: int
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
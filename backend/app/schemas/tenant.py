@@ -7,10 +7,12 @@ class TenantBase(BaseModel):
 
 class TenantCreate(TenantBase):
     shopify_access_token: str
+    timezone: Optional[str] = None
 
 class Tenant(TenantBase):
     id: int
     shopify_access_token: Optional[str] = None
+    timezone: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -0,0 +1,95 @@
+"""
+Set-based upserts for ingested Shopify records
+Each chunk of rows becomes a single INSERT ... ON CONFLICT DO UPDATE statement
+instead of one SELECT plus one INSERT/UPDATE per record.
+
+Tables with a content_hash column get change detection: every row carries a
+64-bit hash of its update columns, and conflicting rows are only rewritten when
+the stored hash differs, so re-ingesting unchanged data leaves no dead tuples.
+"""
+
+import hashlib
+from typing import Iterable, List, NamedTuple, Sequence
+from sqlalchemy import literal_column
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+
+
+CONTENT_HASH_COLUMN = "content_hash"
+
+
+class UpsertCounts(NamedTuple):
+    created: int
+    updated: int
+    unchanged: int  # Existing rows whose content hash matched, left untouched
+
+
+def content_hash(row: dict, columns: Sequence[str]) -> int:
+    """Signed 64-bit hash of the row's values for columns, stable across processes"""
+    digest = hashlib.blake2b(repr(tuple(row[column] for column in columns)).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def chunked(rows: Sequence, size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def dedupe_rows(rows: Iterable[dict], key_columns: Sequence[str]) -> List[dict]:
+    """
+    Keep only the last row for each conflict key.
+    PostgreSQL refuses to update the same row twice within one ON CONFLICT statement.
+    """
+    latest = {}
+    for row in rows:
+        latest[tuple(row[column] for column in key_columns)] = row
+    return list(latest.values())
+
+
+def bulk_upsert(
+    db: Session,
+    model,
+    rows: Iterable[dict],
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str],
+    batch_size: int = None,
+) -> UpsertCounts:
+    """
+    Insert or update rows in chunks of batch_size and return the counts.
+    The caller owns the transaction; nothing is committed here.
+    """
+    rows = dedupe_rows(rows, conflict_columns)
+    batch_size = batch_size or settings.INGEST_BATCH_SIZE
+    table = model.__table__
+    hashed = CONTENT_HASH_COLUMN in table.c
+    set_columns = list(update_columns)
+    if hashed:
+        set_columns.append(CONTENT_HASH_COLUMN)
+        for row in rows:
+            row[CONTENT_HASH_COLUMN] = content_hash(row, update_columns)
+    created = 0
+    updated = 0
+    unchanged = 0
+
+    for batch in chunked(rows, batch_size):
+        stmt = insert(table).values(batch)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(conflict_columns),
+            set_={column: stmt.excluded[column] for column in set_columns},
+            # Rows skipped by the WHERE are neither updated nor returned
+            where=table.c[CONTENT_HASH_COLUMN].is_distinct_from(stmt.excluded[CONTENT_HASH_COLUMN]) if hashed else None,
+        )
+        # xmax is 0 only for freshly inserted tuples, which lets a single
+        # RETURNING distinguish inserts from conflict updates
+        stmt = stmt.returning(literal_column("xmax = 0").label("inserted"))
+        written = 0
+        for inserted, in db.execute(stmt):
+            written += 1
+            if inserted:
+                created += 1
+            else:
+                updated += 1
+        unchanged += len(batch) - written
+
+    return UpsertCounts(created, updated, unchanged)
@@ -0,0 +1,124 @@
+"""
+tenant_daily_stats maintenance
+Every write of orders or customers recomputes the rollup rows of the days it
+touched, from the raw rows of just those days, in the caller's transaction:
+the rollup commits or rolls back together with the write that changed it.
+Recomputing whole days (rather than applying deltas) keeps updates, deletes
+and distinct buyer counts exact. Refreshes of one tenant are serialized by a
+transaction-scoped advisory lock: each recomputes from what it can see, so two
+overlapping writers would otherwise leave whichever finished last, missing
+the other's rows. Days are calendar days in the tenant's timezone; changing
+the timezone requires a rebuild.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, NamedTuple, Set
+from zoneinfo import ZoneInfo
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.models import tenant as tenant_model
+from app.services.dashboard_service import shop_timezone
+
+
+class Rollup(NamedTuple):
+    table: str
+    currency: str
+    metrics: Dict[str, str]  # rollup column -> aggregate over the source rows (aliased src)
+
+
+ROLLUPS = {
+    "orders": Rollup(
+        table='"order"',
+        currency="coalesce(src.currency, '')",
+        metrics={
+            "order_count": "count(*)",
+            "revenue": "coalesce(sum(src.total_price), 0)",
+            "distinct_buyers": "count(DISTINCT src.shopify_customer_id)",
+        },
+    ),
+    "customers": Rollup(
+        table="customer",
+        currency="''",
+        metrics={"new_customers": "count(*)"},
+    ),
+}
+
+def local_days(moments: Iterable[datetime], tz_name: str) -> Set[date]:
+    """Calendar days of the given timestamps in the tenant's timezone (naive ones are UTC)"""
+    zone = ZoneInfo(shop_timezone(tz_name))
+    days = set()
+    for moment in moments:
+        if moment is None:
+            continue
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        days.add(moment.astimezone(zone).date())
+    return days
+
+
+def _day_start(day: date, zone: ZoneInfo) -> datetime:
+    """Start of a local day as naive UTC, the way created_at is stored"""
+    return datetime.combine(day, time(), tzinfo=zone).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _upsert_sql(rollup: Rollup, source: str, day: str) -> str:
+    """INSERT the grouped metrics of one rollup, overwriting only that rollup's columns"""
+    columns = ", ".join(rollup.metrics)
+    aggregates = ", ".join(rollup.metrics.values())
+    updates = ", ".join(f"{column} = excluded.{column}" for column in rollup.metrics)
+    return (
+        f"INSERT INTO tenant_daily_stats (tenant_id, day, currency, {columns}) "
+        f"SELECT :tenant_id, {day}, {rollup.currency}, {aggregates} FROM {source} "
+        "GROUP BY 2, 3 "
+        f"ON CONFLICT (tenant_id, day, currency) DO UPDATE SET {updates}"
+    )
+
+
+def _lock(db: Session, tenant_id: int):
+    """Wait for other rollup writers of the tenant; released when the caller's transaction ends"""
+    db.execute(text("SELECT pg_advisory_xact_lock(hashtext('tenant_daily_stats'), :tenant_id)"), {"tenant_id": tenant_id})
+
+
+def refresh_days(db: Session, tenant: tenant_model.Tenant, resource: str, days: Iterable[date]):
+    """Recompute the rollup rows of resource for the given local days; the caller commits"""
+    rollup = ROLLUPS.get(resource)
+    days = sorted(days)
+    if rollup is None or not days:
+        return
+    zone = ZoneInfo(shop_timezone(tenant.timezone))
+    params = {
+        "tenant_id": tenant.id,
+        "days": days,
+        "starts": [_day_start(day, zone) for day in days],
+        "ends": [_day_start(day + timedelta(days=1), zone) for day in days],
+    }
+    # Each day becomes a created_at range, so the raw rows are found by range scans
+    source = (
+        "unnest(CAST(:days AS date[]), CAST(:starts AS timestamp[]), CAST(:ends AS timestamp[])) AS r(day, starts, ends) "
+        f"JOIN {rollup.table} src ON src.tenant_id = :tenant_id "
+        "AND src.created_at >= r.starts AND src.created_at < r.ends"
+    )
+    # Taken after the raw rows were written, so whoever waits here sees them once the holder commits
+    _lock(db, tenant.id)
+    # Days or currencies that no longer have any rows drop to zero, then empty rows go
+    zeroed = ", ".join(f"{column} = 0" for column in rollup.metrics)
+    db.execute(text(
+        f"UPDATE tenant_daily_stats SET {zeroed} "
+        "WHERE tenant_id = :tenant_id AND day = ANY(CAST(:days AS date[]))"
+    ), params)
+    db.execute(text(_upsert_sql(rollup, source, "r.day")), params)
+    db.execute(text(
+        "DELETE FROM tenant_daily_stats WHERE tenant_id = :tenant_id AND day = ANY(CAST(:days AS date[])) "
+        "AND order_count = 0 AND new_customers = 0"
+    ), params)
+
+
+def rebuild(db: Session, tenant: tenant_model.Tenant):
+    """Recompute the tenant's whole rollup from its raw rows; the caller commits"""
+    params = {"tenant_id": tenant.id, "tz": shop_timezone(tenant.timezone)}
+    _lock(db, tenant.id)
+    db.execute(text("DELETE FROM tenant_daily_stats WHERE tenant_id = :tenant_id"), params)
+    day = "CAST(timezone(:tz, timezone('UTC', src.created_at)) AS date)"
+    for rollup in ROLLUPS.values():
+        source = f"{rollup.table} src WHERE src.tenant_id = :tenant_id AND src.created_at IS NOT NULL"
+        db.execute(text(_upsert_sql(rollup, source, day)), params)
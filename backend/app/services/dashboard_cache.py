@@ -0,0 +1,99 @@
+"""
+Dashboard response cache
+Dashboard payloads only change when ingestion writes, so they are cached per
+tenant and query (date_from, date_to, granularity) and served until the
+tenant's data version moves on. The version is tenant.data_version in the
+database: ingestion marks the tenant on its session (mark_changed) and the
+counter is incremented in that same transaction, just before it commits. Every
+process (API workers, the scheduler, webhook flushes, CLI scripts) therefore
+sees every other process's writes, and a reader can never cache data older
+than the version it read.
+
+The version also makes the ETag: a client revalidating with an unchanged
+version gets 304 without the dashboard queries running at all.
+
+Payloads are kept in process memory, bounded by DASHBOARD_CACHE_MAX_ENTRIES
+(least recently used first out). Writes that bypass mark_changed (hand-run
+SQL, restores) are not seen until the next ingest of the tenant.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models import tenant as tenant_model
+
+# Session.info key holding the tenants written in the current transaction
+_PENDING_KEY = "dashboard_cache_pending"
+
+
+class DashboardCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # (tenant id, key) -> (version, payload), least recently used first
+        self._entries: "OrderedDict[Tuple[int, Hashable], Tuple[int, Any]]" = OrderedDict()
+
+    @staticmethod
+    def etag(tenant_id: int, version: int) -> str:
+        """ETag of whatever the tenant's dashboard returns at a data version"""
+        return f'"{tenant_id}-{version}"'
+
+    def get(self, tenant_id: int, version: int, key: Hashable, compute: Callable[[], Any]) -> Tuple[str, Any, bool]:
+        """
+        (etag, payload, hit) for a query at the tenant's current data version,
+        computing and storing the payload on a miss
+        """
+        with self._lock:
+            entry = self._entries.get((tenant_id, key))
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end((tenant_id, key))
+                return self.etag(tenant_id, version), entry[1], True
+
+        # Computed outside the lock, after version was read: the payload is at
+        # least as new as version, so storing it under version is safe
+        payload = compute()
+        with self._lock:
+            self._entries[(tenant_id, key)] = (version, payload)
+            self._entries.move_to_end((tenant_id, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return self.etag(tenant_id, version), payload, False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+dashboard_cache = DashboardCache(settings.DASHBOARD_CACHE_MAX_ENTRIES)
+
+
+def mark_changed(db: Session, tenant_id: int):
+    """Record that the session's transaction changed a tenant's data; its version is bumped as it commits"""
+    db.info.setdefault(_PENDING_KEY, set()).add(tenant_id)
+
+
+def matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header names etag (weak comparison, as for GET)"""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in (candidate[2:] if candidate.startswith("W/") else candidate for candidate in candidates)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_versions(session: Session):
+    # Last thing in the transaction, so the tenant row lock is held only for the commit itself
+    tenant_ids = session.info.pop(_PENDING_KEY, None)
+    if tenant_ids:
+        Tenant = tenant_model.Tenant
+        session.execute(
+            update(Tenant).where(Tenant.id.in_(sorted(tenant_ids))).values(data_version=Tenant.data_version + 1)
+        )
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,206 @@
+"""
+Dashboard KPIs in a single round trip
+Customer count, order count and revenue, the orders-over-time series and the
+top customers are all computed by PostgreSQL in one statement: the series and
+the top customers come back as JSON arrays next to the totals, so no per-order
+rows are transferred and the cost of a page load does not grow with the
+amount of data sent to the application.
+
+The series is bucketed by hour, day, week or month in the shop's timezone,
+with empty buckets filled in by generate_series, so its size depends on the
+date range and granularity rather than on the number of orders. Open-ended
+ranges cost one extra lookup of the first and last day with orders in the
+rollup, so the size check covers them too.
+
+Totals and day/week/month series are read from the tenant_daily_stats rollup
+(see daily_stats_service), i.e. O(days) rows whatever the order volume; only
+hourly series go to the raw orders, and then only to those in range.
+"""
+
+from datetime import datetime, time, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from sqlalchemy import DateTime, Numeric, cast, func, literal_column, select, true
+from sqlalchemy.dialects.postgresql import INTERVAL, aggregate_order_by
+from sqlalchemy.orm import Session
+from app.models import customer as customer_model, order as order_model, tenant_daily_stats as stats_model
+
+TOP_CUSTOMERS = 5
+
+# Bucket size -> to_char format of its label
+GRANULARITIES = {
+    "hour": 'YYYY-MM-DD"T"HH24:00',
+    "day": "YYYY-MM-DD",
+    "week": "YYYY-MM-DD",  # Monday the week starts on
+    "month": "YYYY-MM",
+}
+
+# Largest series a single request may ask for (about 7 months of hourly buckets)
+MAX_SERIES_BUCKETS = 5000
+
+_EMPTY_JSON_ARRAY = literal_column("'[]'::json")
+
+
+def _json_array(expression, order_by):
+    """json_agg of expression in the given order, or [] when there are no rows"""
+    return func.coalesce(func.json_agg(aggregate_order_by(expression, order_by)), _EMPTY_JSON_ARRAY)
+
+
+def shop_timezone(name: str) -> str:
+    """name if it is a known IANA timezone, otherwise UTC"""
+    try:
+        ZoneInfo(name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        return "UTC"
+    return name or "UTC"
+
+
+def to_utc(moment: datetime, tz_name: str) -> datetime:
+    """Shop-local (naive) or aware datetime -> naive UTC, the way order timestamps are stored"""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=ZoneInfo(tz_name))
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _to_local(moment: datetime, tz_name: str) -> datetime:
+    """Aware datetime -> naive shop-local time; naive ones are already shop-local"""
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone(ZoneInfo(tz_name)).replace(tzinfo=None)
+
+
+def _bucket_count(date_from: datetime, date_to: datetime, granularity: str) -> int:
+    if granularity == "month":
+        return (date_to.year - date_from.year) * 12 + date_to.month - date_from.month + 1
+    seconds = {"hour": 3600, "day": 86400, "week": 7 * 86400}[granularity]
+    return int((date_to - date_from).total_seconds() // seconds) + 1
+
+
+def get_dashboard_data(
+    db: Session,
+    tenant_id: int,
+    date_from: datetime = None,
+    date_to: datetime = None,
+    granularity: str = "day",
+    tz_name: str = "UTC",
+) -> dict:
+    """
+    Dashboard payload for a tenant. Totals and top customers cover all of the
+    tenant's data; date_from/date_to (shop-local unless they carry an offset)
+    only narrow the orders-over-time series, to the hour for hourly series and
+    to whole days otherwise. Without a bound, the series starts or ends at the
+    tenant's first or last order in range.
+    Raises ValueError for an unknown granularity or a range of more than
+    MAX_SERIES_BUCKETS buckets, open ends counted up to the first or last order.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unsupported granularity: {granularity}")
+    tz_name = shop_timezone(tz_name)
+    Order = order_model.Order
+    Customer = customer_model.Customer
+    Stats = stats_model.TenantDailyStats
+
+    range_from, range_to = date_from, date_to
+    if not (range_from and range_to):
+        # An open end reaches the first or last day with orders, which bounds the series just as well
+        first_day, last_day = db.execute(
+            select(func.min(Stats.day), func.max(Stats.day)).where(Stats.tenant_id == tenant_id, Stats.order_count > 0)
+        ).one()
+        if first_day is not None:
+            range_from = range_from or datetime.combine(first_day, time())
+            range_to = range_to or datetime.combine(last_day, time.max)
+    if range_from and range_to:
+        if _bucket_count(to_utc(range_from, tz_name), to_utc(range_to, tz_name), granularity) > MAX_SERIES_BUCKETS:
+            raise ValueError(f"Date range spans more than {MAX_SERIES_BUCKETS} {granularity} buckets")
+
+    totals = select(
+        func.coalesce(func.sum(Stats.new_customers), 0).label("total_customers"),
+        func.coalesce(func.sum(Stats.order_count), 0).label("total_orders"),
+        func.coalesce(func.sum(Stats.revenue), 0).label("total_revenue"),
+    ).where(Stats.tenant_id == tenant_id).cte("totals")
+
+    if granularity == "hour":
+        # Finer than the rollup: bucket the raw orders of the range. Bounds are
+        # converted to stored (UTC) time in Python so the range filter stays a
+        # plain comparison on created_at; only the bucketing is shop-local
+        series_filters = [Order.tenant_id == tenant_id]
+        if date_from:
+            series_filters.append(Order.created_at >= to_utc(date_from, tz_name))
+        if date_to:
+            series_filters.append(Order.created_at <= to_utc(date_to, tz_name))
+        bucket = func.date_trunc(granularity, func.timezone(tz_name, func.timezone("UTC", Order.created_at)))
+        orders, revenue = func.count(Order.id), func.sum(Order.total_price)
+    else:
+        # Whole local days from the rollup; date_to includes its day
+        series_filters = [Stats.tenant_id == tenant_id]
+        if date_from:
+            series_filters.append(Stats.day >= _to_local(date_from, tz_name).date())
+        if date_to:
+            series_filters.append(Stats.day <= _to_local(date_to, tz_name).date())
+        bucket = func.date_trunc(granularity, cast(Stats.day, DateTime))
+        orders, revenue = func.sum(Stats.order_count), func.sum(Stats.revenue)
+    buckets = select(
+        bucket.label("bucket"),
+        orders.label("orders"),
+        revenue.label("revenue"),
+    ).where(*series_filters).group_by(bucket).cte("buckets")
+
+    def bucket_of(moment: datetime):
+        return func.date_trunc(granularity, cast(_to_local(moment, tz_name), DateTime))
+
+    bounds = select(
+        (bucket_of(date_from) if date_from else func.min(buckets.c.bucket)).label("first_bucket"),
+        (bucket_of(date_to) if date_to else func.max(buckets.c.bucket)).label("last_bucket"),
+    ).cte("bounds")
+    slots = func.generate_series(
+        bounds.c.first_bucket, bounds.c.last_bucket, cast(f"1 {granularity}", INTERVAL)
+    ).table_valued("bucket").render_derived(name="slots")
+    series = (
+        select(
+            slots.c.bucket,
+            func.coalesce(buckets.c.orders, 0).label("orders"),
+            func.round(cast(func.coalesce(buckets.c.revenue, 0), Numeric), 2).label("revenue"),
+        )
+        .select_from(bounds)
+        .join(slots, true())
+        .outerjoin(buckets, buckets.c.bucket == slots.c.bucket)
+        .cte("series")
+    )
+
+    top_customers = select(
+        Customer.first_name,
+        Customer.last_name,
+        Customer.total_spent,
+    ).where(Customer.tenant_id == tenant_id).order_by(Customer.total_spent.desc()).limit(TOP_CUSTOMERS).cte("top_customers")
+
+    statement = select(
+        totals.c.total_customers,
+        totals.c.total_orders,
+        totals.c.total_revenue,
+        select(_json_array(
+            func.json_build_array(func.to_char(series.c.bucket, GRANULARITIES[granularity]), series.c.orders, series.c.revenue),
+            series.c.bucket,
+        )).scalar_subquery().label("orders_over_time"),
+        select(_json_array(
+            func.json_build_object(
+                "first_name", top_customers.c.first_name,
+                "last_name", top_customers.c.last_name,
+                "total_spent", top_customers.c.total_spent,
+            ),
+            top_customers.c.total_spent.desc(),
+        )).scalar_subquery().label("top_customers"),
+    ).select_from(totals)
+
+    row = db.execute(statement).one()
+    return {
+        "total_customers": row.total_customers,
+        "total_orders": row.total_orders,
+        "total_revenue": row.total_revenue,
+        "orders_over_time": {
+            "granularity": granularity,
+            "timezone": tz_name,
+            "labels": [label for label, _, _ in row.orders_over_time],
+            "values": [orders for _, orders, _ in row.orders_over_time],
+            "revenue": [revenue for _, _, revenue in row.orders_over_time],
+        },
+        "top_customers": row.top_customers,
+    }
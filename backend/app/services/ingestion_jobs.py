@@ -0,0 +1,172 @@
+"""
+Background ingestion jobs
+Ingest runs are submitted to an in-process worker pool and tracked by job ID,
+so HTTP requests return immediately instead of holding a worker and DB session
+for the whole sync
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import List, Optional
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services import tenant_service
+from app.services.bulk_import_service import BulkImportStats, iter_bulk_pages
+from app.services.ingestion_service import IngestionService
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_PARTIAL = "partial"
+JOB_FAILED = "failed"
+
+
+class IngestionJob:
+    """Progress of one background ingest; updated by the worker, read by the API"""
+
+    def __init__(self, tenant_id: int, resources: List[str], full_resync: bool, bulk_source: str = None):
+        self._lock = threading.Lock()
+        self.id = uuid.uuid4().hex
+        self.tenant_id = tenant_id
+        self.resources = resources
+        self.full_resync = full_resync
+        # Bulk-operation JSONL export to import instead of paging the REST API
+        self.bulk_source = bulk_source
+        self.status = JOB_QUEUED
+        self.current_resource = None
+        self.submitted_at = datetime.now(timezone.utc)
+        self.started_at = None
+        self.finished_at = None
+        self._started_monotonic = None
+        self._finished_monotonic = None
+        self.pages_fetched = 0
+        self.rows_written = 0
+        self.errors = []
+        self.results = {}
+
+    def start(self):
+        with self._lock:
+            self.status = JOB_RUNNING
+            self.started_at = datetime.now(timezone.utc)
+            self._started_monotonic = time.monotonic()
+
+    def record_page(self, resource: str, rows_written: int):
+        """Progress hook called by IngestionService after each page is committed"""
+        with self._lock:
+            self.current_resource = resource
+            self.pages_fetched += 1
+            self.rows_written += rows_written
+
+    def record_result(self, resource: str, result: dict):
+        with self._lock:
+            self.results[resource] = result
+            if result.get("status") != "success":
+                self.errors.append(f"{resource}: {result.get('message', 'unknown error')}")
+
+    def fail(self, message: str):
+        with self._lock:
+            self.errors.append(message)
+
+    def finish(self):
+        with self._lock:
+            self.current_resource = None
+            self.finished_at = datetime.now(timezone.utc)
+            self._finished_monotonic = time.monotonic()
+            succeeded = any(result.get("status") == "success" for result in self.results.values())
+            if not self.errors:
+                self.status = JOB_SUCCEEDED
+            elif succeeded:
+                self.status = JOB_PARTIAL
+            else:
+                self.status = JOB_FAILED
+
+    @property
+    def is_finished(self) -> bool:
+        return self.finished_at is not None
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            elapsed = 0.0
+            if self._started_monotonic is not None:
+                end = self._finished_monotonic or time.monotonic()
+                elapsed = end - self._started_monotonic
+            return {
+                "id": self.id,
+                "status": self.status,
+                "resources": self.resources,
+                "full_resync": self.full_resync,
+                "bulk_source": self.bulk_source,
+                "current_resource": self.current_resource,
+                "submitted_at": self.submitted_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "elapsed_seconds": round(elapsed, 3),
+                "pages_fetched": self.pages_fetched,
+                "rows_written": self.rows_written,
+                "rows_per_sec": round(self.rows_written / elapsed, 1) if elapsed else 0.0,
+                "errors": list(self.errors),
+                "results": dict(self.results),
+            }
+
+
+class IngestionJobManager:
+    def __init__(self, max_workers: int, history_size: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest")
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self._history_size = history_size
+
+    def submit(self, tenant_id: int, resources: List[str], full_resync: bool = False, bulk_source: str = None) -> IngestionJob:
+        job = IngestionJob(tenant_id, resources, full_resync, bulk_source=bulk_source)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict_finished()
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _evict_finished(self):
+        # Oldest finished jobs go first; queued and running jobs are never dropped
+        excess = len(self._jobs) - self._history_size
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.is_finished][:max(excess, 0)]:
+            del self._jobs[job_id]
+
+    def _run(self, job: IngestionJob):
+        job.start()
+        db = SessionLocal()
+        try:
+            tenant = tenant_service.get_tenant(db, job.tenant_id)
+            if tenant is None:
+                job.fail(f"Tenant {job.tenant_id} not found")
+                return
+            ingestion_service = IngestionService(db, tenant, progress=job)
+            for resource in job.resources:
+                if job.bulk_source:
+                    stats = BulkImportStats()
+                    pages = iter_bulk_pages(job.bulk_source, resource, stats=stats)
+                    result = ingestion_service.ingest_pages(resource, pages, mode="bulk")
+                    result["bulk"] = stats.to_dict()
+                else:
+                    result = getattr(ingestion_service, f"ingest_{resource}")(full_resync=job.full_resync)
+                job.record_result(resource, result)
+        except Exception as e:
+            job.fail(f"Ingestion job error: {str(e)}")
+        finally:
+            db.close()
+            job.finish()
+
+
+job_manager = IngestionJobManager(
+    max_workers=settings.INGEST_WORKER_CONCURRENCY,
+    history_size=settings.INGEST_JOB_HISTORY_SIZE,
+)
@@ -1,231 +1,686 @@
+import asyncio
+import itertools
+import logging
+import time
+import httpx
 import requests
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, NamedTuple, Sequence
+from sqlalchemy import delete, select, update
 from sqlalchemy.orm import Session
 from app.models import tenant as tenant_model, product as product_model, order as order_model, customer as customer_model
-from app.schemas import product as product_schema, order as order_schema, customer as customer_schema
+from app.models import order_line_item as line_item_model
 from app.core.config import settings
+from app.core.metrics import INGEST_ROWS, INGEST_ROWS_PER_SECOND, stage_timer
+from app.services import copy_loader, daily_stats_service, payload_archive, shopify_synthetic, sync_state_service
+from app.services.dashboard_cache import mark_changed
+from app.services.bulk_upsert import CONTENT_HASH_COLUMN, bulk_upsert, content_hash
+from app.services.shopify_async_client import AsyncShopifyClient
+from app.services.shopify_client import MAX_PAGE_SIZE, ShopifyClient, ShopifyAPIError
+from app.services.shopify_decode import RESOURCE_FIELDS
 from app.services.shopify_mock_fixtures import ShopifyMockFixtures
 
+logger = logging.getLogger(__name__)
+
+
+def _parse_shopify_datetime(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _max_updated_at(records, current: datetime = None) -> datetime:
+    """Highest updated_at in a page, normalised to UTC for watermark comparisons"""
+    for record in records:
+        if not record.get("updated_at"):
+            continue
+        updated_at = _parse_shopify_datetime(record["updated_at"])
+        if updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        updated_at = updated_at.astimezone(timezone.utc)
+        if current is None or updated_at > current:
+            current = updated_at
+    return current
+
+
+def _product_row(tenant_id: int, product_data: dict) -> dict:
+    return {
+        "shopify_product_id": str(product_data["id"]),
+        "title": product_data.get("title", ""),
+        "vendor": product_data.get("vendor", ""),
+        "product_type": product_data.get("product_type", ""),
+        # Always present: COPY backfills take their columns from the first row and skip Python defaults
+        "created_at": _parse_shopify_datetime(product_data["created_at"]) if product_data.get("created_at") else datetime.utcnow(),
+        "tenant_id": tenant_id,
+    }
+
+
+def _order_row(tenant_id: int, order_data: dict) -> dict:
+    customer = order_data.get("customer")
+    return {
+        "shopify_order_id": str(order_data["id"]),
+        "total_price": float(order_data.get("total_price", 0)),
+        "currency": order_data.get("currency", "USD"),
+        "created_at": _parse_shopify_datetime(order_data["created_at"]),
+        "shopify_customer_id": str(customer["id"]) if customer and customer.get("id") else None,
+        "tenant_id": tenant_id,
+    }
+
+
+# A line item never moves between orders, so order_id is not refreshed (or hashed)
+LINE_ITEM_UPDATE_COLUMNS = (
+    "shopify_order_id", "shopify_product_id", "shopify_variant_id", "title", "sku",
+    "quantity", "price", "created_at",
+)
+
+
+def _line_item_row(tenant_id: int, order_id: int, order_data: dict, item_data: dict) -> dict:
+    return {
+        "shopify_line_item_id": str(item_data["id"]),
+        "shopify_order_id": str(order_data["id"]),
+        "shopify_product_id": str(item_data["product_id"]) if item_data.get("product_id") else None,
+        "shopify_variant_id": str(item_data["variant_id"]) if item_data.get("variant_id") else None,
+        "title": item_data.get("title", ""),
+        "sku": item_data.get("sku"),
+        "quantity": int(item_data.get("quantity") or 0),
+        "price": float(item_data.get("price") or 0),
+        "created_at": _parse_shopify_datetime(order_data["created_at"]),
+        "order_id": order_id,
+        "tenant_id": tenant_id,
+    }
+
+
+def _order_customer_id():
+    """
+    Correlated lookup of an order's customer row. Each order resolves through the
+    (tenant_id, shopify_customer_id) unique index, which keeps the plan cheap even
+    when the planner has no statistics for a freshly loaded tenant.
+    """
+    Order = order_model.Order
+    Customer = customer_model.Customer
+    return select(Customer.id).where(
+        Customer.tenant_id == Order.tenant_id,
+        Customer.shopify_customer_id == Order.shopify_customer_id,
+    ).scalar_subquery()
+
+
+def _write_order_details(db: Session, tenant_id: int, orders):
+    """
+    Follow-up to an orders upsert, in the same transaction: link the orders to
+    their customers and bulk upsert their line items
+    """
+    Order = order_model.Order
+    LineItem = line_item_model.OrderLineItem
+    order_ids = [str(order["id"]) for order in orders]
+
+    # Orders whose customer is not ingested yet stay NULL until _link_customer_orders picks them up
+    customer_id = _order_customer_id()
+    db.execute(
+        update(Order)
+        .where(
+            Order.tenant_id == tenant_id,
+            Order.shopify_order_id.in_(order_ids),
+            Order.customer_id.is_distinct_from(customer_id),
+        )
+        .values(customer_id=customer_id)
+        .execution_options(synchronize_session=False)
+    )
+
+    ids = dict(db.query(Order.shopify_order_id, Order.id).filter(
+        Order.tenant_id == tenant_id, Order.shopify_order_id.in_(order_ids)
+    ))
+    rows = []
+    for order in orders:
+        # Orders without line items in the payload keep the ones already stored
+        for item in order.get("line_items") or []:
+            try:
+                rows.append(_line_item_row(tenant_id, ids[str(order["id"])], order, item))
+            except Exception as e:
+                logger.warning("Error processing line item %s of order %s: %s", item.get("id", "unknown"), order["id"], e)
+    if not rows:
+        return
+
+    # An edited order can drop line items; the payload is the full current set
+    db.query(LineItem).filter(
+        LineItem.order_id.in_({row["order_id"] for row in rows}),
+        LineItem.shopify_line_item_id.notin_([row["shopify_line_item_id"] for row in rows]),
+    ).delete(synchronize_session=False)
+    bulk_upsert(
+        db,
+        LineItem,
+        rows,
+        conflict_columns=("tenant_id", "shopify_line_item_id"),
+        update_columns=LINE_ITEM_UPDATE_COLUMNS,
+    )
+
+
+def _link_customer_orders(db: Session, tenant_id: int, customers):
+    """Point already-stored orders at a page of newly written customers"""
+    Order = order_model.Order
+    customer_id = _order_customer_id()
+    db.execute(
+        update(Order)
+        .where(
+            Order.tenant_id == tenant_id,
+            Order.shopify_customer_id.in_([str(customer["id"]) for customer in customers]),
+            Order.customer_id.is_distinct_from(customer_id),
+        )
+        .values(customer_id=customer_id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _customer_row(tenant_id: int, customer_data: dict) -> dict:
+    return {
+        "shopify_customer_id": str(customer_data["id"]),
+        "first_name": customer_data.get("first_name", ""),
+        "last_name": customer_data.get("last_name", ""),
+        "email": customer_data.get("email", ""),
+        "total_spent": float(customer_data.get("total_spent", 0)),
+        "created_at": _parse_shopify_datetime(customer_data["created_at"]),
+        "tenant_id": tenant_id,
+    }
+
+
+class ResourceSpec(NamedTuple):
+    model: Any
+    key: str  # Shopify id column, unique per tenant
+    to_row: Callable[[int, dict], dict]
+    update_columns: Sequence[str]  # Columns refreshed when the row already exists
+    # Runs after the upsert with (db, tenant_id, records), within the same transaction
+    after_write: Callable[[Session, int, list], None] = None
+
+
+RESOURCES = {
+    "products": ResourceSpec(
+        model=product_model.Product,
+        key="shopify_product_id",
+        to_row=_product_row,
+        update_columns=("title", "vendor", "product_type"),
+    ),
+    "orders": ResourceSpec(
+        model=order_model.Order,
+        key="shopify_order_id",
+        to_row=_order_row,
+        update_columns=("total_price", "currency", "shopify_customer_id"),
+        after_write=_write_order_details,
+    ),
+    "customers": ResourceSpec(
+        model=customer_model.Customer,
+        key="shopify_customer_id",
+        to_row=_customer_row,
+        update_columns=("first_name", "last_name", "email", "total_spent"),
+        after_write=_link_customer_orders,
+    ),
+}
+
+
+class _ResourceRun:
+    """Progress and result bookkeeping for one resource within an ingest run"""
+
+    def __init__(self, tenant_id: int, resource: str, params: dict, incremental: bool, mode: str = None):
+        self.tenant_id = tenant_id
+        self.resource = resource
+        self.params = params
+        self.mode = mode or ("mock" if not settings.USE_SHOPIFY_API else "live")
+        self.max_updated_at = None
+        self.started_at = datetime.now(timezone.utc)
+        self.started = time.monotonic()
+        self.result = {
+            "created": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "total_processed": 0,
+            "pages": 0,
+            "incremental": incremental,
+            "updated_at_min": params.get("updated_at_min"),
+        }
+
+    def record_page(self, records, created: int, updated: int, unchanged: int):
+        self.max_updated_at = _max_updated_at(records, self.max_updated_at)
+        self.result["created"] += created
+        self.result["updated"] += updated
+        self.result["unchanged"] += unchanged
+        self.result["total_processed"] += len(records)
+        self.result["pages"] += 1
+
+    def watermark(self) -> datetime:
+        """
+        Highest updated_at seen, capped at the run's start less the clock skew
+        allowance. Pages come in id order, so a record edited mid-run can land on
+        a page already fetched; the cap makes the next run fetch it again.
+        """
+        if self.max_updated_at is None:
+            return None
+        return min(self.max_updated_at, self.started_at - timedelta(seconds=settings.SYNC_WATERMARK_SKEW_SECONDS))
+
+    def success(self) -> dict:
+        elapsed = time.monotonic() - self.started
+        rows_per_sec = self.result["total_processed"] / elapsed if elapsed else 0.0
+        INGEST_ROWS_PER_SECOND.labels(str(self.tenant_id), self.resource).set(rows_per_sec)
+        return {
+            "status": "success",
+            **self.result,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_sec": round(rows_per_sec, 1),
+            "mode": self.mode
+        }
+
+    def error(self, message: str) -> dict:
+        return {"status": "error", "message": message, **self.result}
+
+
 class IngestionService:
-    def __init__(self, db: Session, tenant: tenant_model.Tenant):
+    # Extra list-endpoint filters sent on the first page of each resource;
+    # fields= limits the payload to what the decoder and row builders read
+    RESOURCE_PARAMS = {
+        "products": {"fields": RESOURCE_FIELDS["products"]},
+        "orders": {"status": "any", "fields": RESOURCE_FIELDS["orders"]},
+        "customers": {"fields": RESOURCE_FIELDS["customers"]},
+    }
+
+    def __init__(self, db: Session, tenant: tenant_model.Tenant, progress=None):
         self.db = db
         self.tenant = tenant
-        self.headers = {
-            "X-Shopify-Access-Token": self.tenant.shopify_access_token
-        }
-        self.base_url = f"https://{self.tenant.shopify_store_url}/admin/api/{settings.SHOPIFY_API_VERSION}"
+        self.client = ShopifyClient(tenant)
+        # Optional observer with record_page(resource, rows_written), e.g. a background job
+        self.progress = progress
+
+    def close(self):
+        """Release the Shopify client's pooled connections"""
+        self.client.close()
 
-    def ingest_products(self):
+    def ingest_products(self, full_resync: bool = False):
         """
-        Ingest products from Shopify API with error handling and pagination
+        Ingest products from Shopify API, streaming every page of the catalogue
+        Only products updated since the last successful sync are requested unless full_resync is set
         Supports both real API calls and mock mode based on USE_SHOPIFY_API setting
         """
-        try:
-            if settings.USE_SHOPIFY_API:
-                # Real Shopify API call
-                url = f"{self.base_url}/products.json"
-                response = requests.get(url, headers=self.headers, timeout=30)
-                
-                if response.status_code == 200:
-                    products_data = response.json()
-                elif response.status_code == 401:
-                    return {"status": "error", "message": "Invalid Shopify access token"}
-                elif response.status_code == 429:
-                    return {"status": "error", "message": "Rate limit exceeded. Please try again later."}
-                else:
-                    return {"status": "error", "message": f"Shopify API error: {response.status_code}"}
-            else:
-                # Mock mode - return realistic fixtures
-                products_data = ShopifyMockFixtures.get_products_response()
-            
-            products = products_data.get("products", [])
-            created_count = 0
-            updated_count = 0
-            
-            for product_data in products:
-                try:
-                    # Check if product already exists
-                    existing_product = self.db.query(product_model.Product).filter(
-                        product_model.Product.shopify_product_id == str(product_data["id"]),
-                        product_model.Product.tenant_id == self.tenant.id
-                    ).first()
-                    
-                    if existing_product:
-                        # Update existing product
-                        existing_product.title = product_data.get("title", "")
-                        existing_product.vendor = product_data.get("vendor", "")
-                        existing_product.product_type = product_data.get("product_type", "")
-                        updated_count += 1
-                    else:
-                        # Create new product
-                        product = product_model.Product(
-                            shopify_product_id=str(product_data["id"]),
-                            title=product_data.get("title", ""),
-                            vendor=product_data.get("vendor", ""),
-                            product_type=product_data.get("product_type", ""),
-                            tenant_id=self.tenant.id
-                        )
-                        self.db.add(product)
-                        created_count += 1
-                        
-                except Exception as e:
-                    print(f"Error processing product {product_data.get('id', 'unknown')}: {e}")
-                    continue
-            
-            self.db.commit()
-            return {
-                "status": "success",
-                "created": created_count,
-                "updated": updated_count,
-                "total_processed": len(products),
-                "mode": "mock" if not settings.USE_SHOPIFY_API else "live"
+        return self._ingest("products", full_resync)
+
+    def ingest_orders(self, full_resync: bool = False):
+        """
+        Ingest orders from Shopify API, streaming every page of the order history
+        Only orders updated since the last successful sync are requested unless full_resync is set
+        Supports both real API calls and mock mode based on USE_SHOPIFY_API setting
+        """
+        return self._ingest("orders", full_resync)
+
+    def ingest_customers(self, full_resync: bool = False):
+        """
+        Ingest customers from Shopify API, streaming every page of customers
+        Only customers updated since the last successful sync are requested unless full_resync is set
+        Supports both real API calls and mock mode based on USE_SHOPIFY_API setting
+        """
+        return self._ingest("customers", full_resync)
+
+    def _fetch_pages(self, resource: str, params: dict):
+        """
+        Yield lists of raw Shopify records, one list per API page,
+        archiving each page first when PAYLOAD_ARCHIVE_ENABLED is set
+        """
+        for records in self._fetch_raw_pages(resource, params):
+            self._archive_page(resource, records)
+            yield records
+
+    def _fetch_raw_pages(self, resource: str, params: dict):
+        """
+        Yield lists of raw Shopify records, one list per API page.
+        Mock mode serves the fixtures as a single page, or pages of the tenant's
+        synthetic store when MOCK_DATA_SOURCE is "synthetic".
+        """
+        if settings.USE_SHOPIFY_API:
+            yield from self.client.iter_pages(resource, params)
+        elif settings.MOCK_DATA_SOURCE == "synthetic":
+            yield from shopify_synthetic.store_for_tenant(self.tenant.id).iter_pages(resource, params, MAX_PAGE_SIZE)
+        else:
+            fixtures = {
+                "products": ShopifyMockFixtures.get_products_response,
+                "orders": ShopifyMockFixtures.get_orders_response,
+                "customers": ShopifyMockFixtures.get_customers_response,
             }
-                
-        except requests.exceptions.Timeout:
-            return {"status": "error", "message": "Request timeout. Shopify API may be slow."}
-        except requests.exceptions.ConnectionError:
-            return {"status": "error", "message": "Connection error. Check internet connection."}
+            records = fixtures[resource]().get(resource, [])
+            if "updated_at_min" in params:
+                # Emulate Shopify's server-side filter so incremental syncs behave the same in mock mode
+                updated_at_min = _parse_shopify_datetime(params["updated_at_min"])
+                records = [r for r in records if _max_updated_at([r]) >= updated_at_min]
+            yield records
+
+    def _archive_page(self, resource: str, records):
+        if settings.PAYLOAD_ARCHIVE_ENABLED:
+            payload_archive.append_page(self.tenant.id, resource, records)
+
+    def _start_run(self, resource: str, full_resync: bool) -> "_ResourceRun":
+        params = dict(self.RESOURCE_PARAMS[resource])
+        watermark = None if full_resync else sync_state_service.get_watermark(self.db, self.tenant.id, resource)
+        if watermark:
+            params["updated_at_min"] = watermark.isoformat()
+        return _ResourceRun(self.tenant.id, resource, params, incremental=watermark is not None)
+
+    def _apply_page(self, run: "_ResourceRun", records):
+        """Write one page of records and commit it before the next page is fetched"""
+        created, updated, unchanged = self.write_records(run.resource, records)
+        self.db.commit()
+        run.record_page(records, created, updated, unchanged)
+        if self.progress is not None:
+            self.progress.record_page(run.resource, created + updated)
+
+    def _finish_run(self, run: "_ResourceRun"):
+        """Advance the watermark once every page of the run has been written"""
+        sync_state_service.set_watermark(self.db, self.tenant.id, run.resource, run.watermark())
+        self.db.commit()
+
+    def _ingest(self, resource: str, full_resync: bool = False):
+        """
+        Generator pipeline: fetch a page, write it, commit, then fetch the next one.
+        Only a single page of records is held in memory at any time.
+        The updated_at watermark only advances once every page has been written.
+        """
+        run = self._start_run(resource, full_resync)
+        return self._run_pages(run, self._fetch_pages(resource, run.params))
+
+    def ingest_pages(self, resource: str, pages, mode: str):
+        """
+        Run the same write pipeline over pages from a source other than the
+        REST API, such as a bulk-operation export; mode labels the source in the result
+        """
+        run = _ResourceRun(self.tenant.id, resource, {}, incremental=False, mode=mode)
+        return self._run_pages(run, pages)
+
+    def replay(self, resource: str):
+        """
+        Re-run ingestion for a resource from the tenant's raw payload archive,
+        without any network access
+        """
+        return self.ingest_pages(resource, payload_archive.iter_pages(self.tenant.id, resource), mode="replay")
+
+    def _run_pages(self, run: "_ResourceRun", pages):
+        try:
+            for records in pages:
+                self._apply_page(run, records)
+            self._finish_run(run)
         except Exception as e:
-            return {"status": "error", "message": f"Unexpected error: {str(e)}"}
+            return self._fail_run(run, e)
 
-    def ingest_orders(self):
+        return run.success()
+
+    def _fail_run(self, run: "_ResourceRun", error: Exception) -> dict:
+        """Roll back the current transaction and describe the failure in the run's result"""
+        self.db.rollback()
+        if isinstance(error, ShopifyAPIError):
+            return run.error(error.message)
+        if isinstance(error, requests.exceptions.Timeout):
+            return run.error("Request timeout. Shopify API may be slow.")
+        if isinstance(error, requests.exceptions.ConnectionError):
+            return run.error("Connection error. Check internet connection.")
+        return run.error(f"{run.resource.capitalize()} ingestion error: {str(error)}")
+
+    def backfill(self, resource: str, pages=None):
         """
-        Ingest orders from Shopify API with comprehensive error handling
-        Supports both real API calls and mock mode based on USE_SHOPIFY_API setting
+        Initial load for a new tenant: stream every record through COPY into an
+        unlogged staging table and merge it with one INSERT ... SELECT per table.
+        Rows that already exist are skipped rather than updated, and the whole
+        load is a single transaction. pages defaults to a full fetch from Shopify.
         """
+        spec = RESOURCES[resource]
+        run = _ResourceRun(self.tenant.id, resource, {}, incremental=False, mode="copy")
+        if pages is None:
+            pages = self._fetch_pages(resource, dict(self.RESOURCE_PARAMS[resource]))
+        # Order line items are collected on the side while the orders themselves are copied
+        line_items = copy_loader.CopySpool() if resource == "orders" else None
+
+        def rows():
+            for records in pages:
+                for record in records:
+                    try:
+                        row = spec.to_row(self.tenant.id, record)
+                    except Exception as e:
+                        logger.warning("Error processing %s %s: %s", resource[:-1], record.get("id", "unknown"), e)
+                        continue
+                    # Same hash the upsert path stores, so the next sync sees these rows as unchanged
+                    row[CONTENT_HASH_COLUMN] = content_hash(row, spec.update_columns)
+                    yield row
+                    if line_items is not None:
+                        self._spool_line_items(line_items, record)
+                run.record_page(records, 0, 0, 0)
+
         try:
-            if settings.USE_SHOPIFY_API:
-                # Real Shopify API call
-                url = f"{self.base_url}/orders.json?status=any&limit=250"
-                response = requests.get(url, headers=self.headers, timeout=30)
-                
-                if response.status_code == 200:
-                    orders_data = response.json()
+            row_iter = rows()
+            first = next(row_iter, None)
+            if first is not None:
+                columns = list(first)
+                with copy_loader.staging_table(self.db, spec.model, columns) as staging:
+                    stream = copy_loader.CopyRowStream(itertools.chain([first], row_iter), columns)
+                    # COPY pulls pages as it goes, so only the merges are timed as db_write
+                    copy_loader.copy_into(self.db, staging, columns, stream)
+                    with stage_timer(self.tenant.id, resource, "db_write"):
+                        run.result["created"] = self._merge_backfill(resource, staging, columns)
+                if line_items is not None and line_items.rows:
+                    with stage_timer(self.tenant.id, resource, "db_write"):
+                        run.result["line_items"] = self._backfill_line_items(line_items)
+                if run.result["created"] and resource in daily_stats_service.ROLLUPS:
+                    with stage_timer(self.tenant.id, resource, "db_write"):
+                        daily_stats_service.rebuild(self.db, self.tenant)
+                if run.result["created"]:
+                    mark_changed(self.db, self.tenant.id)
+            self._finish_run(run)
+        except Exception as e:
+            return self._fail_run(run, e)
+        finally:
+            if line_items is not None:
+                line_items.close()
+
+        run.result["skipped"] = run.result["total_processed"] - run.result["created"]
+        INGEST_ROWS.labels(str(self.tenant.id), resource, "created").inc(run.result["created"])
+        INGEST_ROWS.labels(str(self.tenant.id), resource, "skipped").inc(run.result["skipped"])
+        return run.success()
+
+    def _spool_line_items(self, spool: copy_loader.CopySpool, order_data):
+        for item in order_data.get("line_items") or []:
+            try:
+                row = _line_item_row(self.tenant.id, None, order_data, item)
+            except Exception as e:
+                logger.warning("Error processing line item %s of order %s: %s", item.get("id", "unknown"), order_data["id"], e)
+                continue
+            # order_id is resolved by the merge, once the orders exist
+            del row["order_id"]
+            row[CONTENT_HASH_COLUMN] = content_hash(row, LINE_ITEM_UPDATE_COLUMNS)
+            spool.write(row)
+
+    def _merge_backfill(self, resource: str, staging: str, columns) -> int:
+        spec = RESOURCES[resource]
+        conflict_columns = ("tenant_id", spec.key)
+        if resource == "orders":
+            return copy_loader.merge_staging(
+                self.db, spec.model, staging, columns, conflict_columns,
+                extra_columns={"customer_id": "c.id"},
+                joins="LEFT JOIN customer c ON c.tenant_id = s.tenant_id "
+                      "AND c.shopify_customer_id = s.shopify_customer_id",
+            )
+
+        created = copy_loader.merge_staging(self.db, spec.model, staging, columns, conflict_columns)
+        if resource == "customers":
+            Order = order_model.Order
+            Customer = customer_model.Customer
+            self.db.execute(
+                update(Order)
+                .where(
+                    Order.tenant_id == self.tenant.id,
+                    Order.customer_id.is_(None),
+                    Customer.tenant_id == self.tenant.id,
+                    Order.shopify_customer_id == Customer.shopify_customer_id,
+                )
+                .values(customer_id=Customer.id)
+                .execution_options(synchronize_session=False)
+            )
+        return created
+
+    def _backfill_line_items(self, spool: copy_loader.CopySpool) -> int:
+        LineItem = line_item_model.OrderLineItem
+        with copy_loader.staging_table(self.db, LineItem, spool.columns) as staging:
+            copy_loader.copy_into(self.db, staging, spool.columns, spool.rewind())
+            return copy_loader.merge_staging(
+                self.db, LineItem, staging, spool.columns, ("tenant_id", "shopify_line_item_id"),
+                extra_columns={"order_id": "o.id"},
+                joins='JOIN "order" o ON o.tenant_id = s.tenant_id AND o.shopify_order_id = s.shopify_order_id',
+            )
+
+    async def ingest_all(self, full_resync: bool = False):
+        """
+        Ingest products, orders and customers concurrently.
+        Each resource is fetched by its own task over the store's pooled async
+        connection; fetched pages go through a bounded queue to a single writer
+        that applies them in a worker thread, so total latency tracks the slowest
+        resource while the Session is still only used by one thread at a time.
+        """
+        resources = list(RESOURCES)
+        runs = {}
+        for resource in resources:
+            runs[resource] = await asyncio.to_thread(self._start_run, resource, full_resync)
+
+        # A small queue gives backpressure: fetchers pause while the writer catches up
+        queue = asyncio.Queue(maxsize=len(resources) * 2)
+        errors = {}
+
+        async def fetch(resource: str):
+            run = runs[resource]
+            try:
+                if settings.USE_SHOPIFY_API:
+                    client = AsyncShopifyClient(self.tenant)
+                    async for records in client.iter_pages(resource, run.params):
+                        if settings.PAYLOAD_ARCHIVE_ENABLED:
+                            await asyncio.to_thread(self._archive_page, resource, records)
+                        await queue.put((resource, records))
                 else:
-                    return {"status": "error", "message": f"Shopify API error: {response.status_code}"}
-            else:
-                # Mock mode - return realistic fixtures
-                orders_data = ShopifyMockFixtures.get_orders_response()
-                
-            orders = orders_data.get("orders", [])
-            created_count = 0
-            updated_count = 0
-            
-            for order_data in orders:
+                    # Synthetic pages and archive writes are CPU and disk work: pull pages in a
+                    # worker thread so the event loop keeps serving the other fetchers and the writer
+                    pages = self._fetch_pages(resource, run.params)
+                    while True:
+                        records = await asyncio.to_thread(next, pages, None)
+                        if records is None:
+                            break
+                        await queue.put((resource, records))
+            except ShopifyAPIError as e:
+                errors[resource] = e.message
+            except httpx.TimeoutException:
+                errors[resource] = "Request timeout. Shopify API may be slow."
+            except httpx.TransportError:
+                errors[resource] = "Connection error. Check internet connection."
+            except Exception as e:
+                errors[resource] = f"{resource.capitalize()} ingestion error: {str(e)}"
+            finally:
+                await queue.put((resource, None))
+
+        async def write():
+            # Keeps draining the queue even after a failure so no fetcher blocks on put()
+            remaining = len(resources)
+            write_failed = set()
+            while remaining:
+                resource, records = await queue.get()
+                if resource in write_failed:
+                    if records is None:
+                        remaining -= 1
+                    continue
                 try:
-                    # Check if order already exists
-                    existing_order = self.db.query(order_model.Order).filter(
-                        order_model.Order.shopify_order_id == str(order_data["id"]),
-                        order_model.Order.tenant_id == self.tenant.id
-                    ).first()
-                    
-                    # Parse created_at date
-                    from datetime import datetime
-                    created_at = datetime.fromisoformat(order_data["created_at"].replace('Z', '+00:00'))
-                    
-                    if existing_order:
-                        # Update existing order
-                        existing_order.total_price = float(order_data.get("total_price", 0))
-                        existing_order.currency = order_data.get("currency", "USD")
-                        updated_count += 1
+                    if records is None:
+                        remaining -= 1
+                        if resource not in errors:
+                            await asyncio.to_thread(self._finish_run, runs[resource])
                     else:
-                        # Create new order
-                        order = order_model.Order(
-                            shopify_order_id=str(order_data["id"]),
-                            total_price=float(order_data.get("total_price", 0)),
-                            currency=order_data.get("currency", "USD"),
-                            created_at=created_at,
-                            tenant_id=self.tenant.id
-                        )
-                        self.db.add(order)
-                        created_count += 1
-                        
+                        await asyncio.to_thread(self._apply_page, runs[resource], records)
                 except Exception as e:
-                    print(f"Error processing order {order_data.get('id', 'unknown')}: {e}")
-                    continue
-            
-            self.db.commit()
-            return {
-                "status": "success",
-                "created": created_count,
-                "updated": updated_count,
-                "total_processed": len(orders),
-                "mode": "mock" if not settings.USE_SHOPIFY_API else "live"
-            }
-                
-        except Exception as e:
-            return {"status": "error", "message": f"Orders ingestion error: {str(e)}"}
+                    await asyncio.to_thread(self.db.rollback)
+                    write_failed.add(resource)
+                    errors[resource] = f"{resource.capitalize()} ingestion error: {str(e)}"
+
+        await asyncio.gather(write(), *(fetch(resource) for resource in resources))
 
-    def ingest_customers(self):
+        results = {
+            resource: run.error(errors[resource]) if resource in errors else run.success()
+            for resource, run in runs.items()
+        }
+        if not errors:
+            status = "success"
+        elif len(errors) < len(resources):
+            status = "partial"
+        else:
+            status = "error"
+        return {"status": status, **results}
+
+    def write_records(self, resource: str, records):
         """
-        Ingest customers from Shopify API with error handling
-        Supports both real API calls and mock mode based on USE_SHOPIFY_API setting
+        Transform a page of Shopify records into rows and upsert them in bulk
+        Also used for records that arrive without a fetch (webhooks); the caller commits
+        Returns (created, updated, unchanged) counts
         """
-        try:
-            if settings.USE_SHOPIFY_API:
-                # Real Shopify API call
-                url = f"{self.base_url}/customers.json?limit=250"
-                response = requests.get(url, headers=self.headers, timeout=30)
-                
-                if response.status_code == 200:
-                    customers_data = response.json()
-                else:
-                    return {"status": "error", "message": f"Shopify API error: {response.status_code}"}
-            else:
-                # Mock mode - return realistic fixtures
-                customers_data = ShopifyMockFixtures.get_customers_response()
-                
-            customers = customers_data.get("customers", [])
-            created_count = 0
-            updated_count = 0
-            
-            for customer_data in customers:
+        spec = RESOURCES[resource]
+        rows = []
+        written = []
+        with stage_timer(self.tenant.id, resource, "transform"):
+            for record in records:
                 try:
-                    # Check if customer already exists
-                    existing_customer = self.db.query(customer_model.Customer).filter(
-                        customer_model.Customer.shopify_customer_id == str(customer_data["id"]),
-                        customer_model.Customer.tenant_id == self.tenant.id
-                    ).first()
-                    
-                    # Parse created_at date
-                    from datetime import datetime
-                    created_at = datetime.fromisoformat(customer_data["created_at"].replace('Z', '+00:00'))
-                    
-                    if existing_customer:
-                        # Update existing customer
-                        existing_customer.first_name = customer_data.get("first_name", "")
-                        existing_customer.last_name = customer_data.get("last_name", "")
-                        existing_customer.email = customer_data.get("email", "")
-                        existing_customer.total_spent = float(customer_data.get("total_spent", 0))
-                        updated_count += 1
-                    else:
-                        # Create new customer
-                        customer = customer_model.Customer(
-                            shopify_customer_id=str(customer_data["id"]),
-                            first_name=customer_data.get("first_name", ""),
-                            last_name=customer_data.get("last_name", ""),
-                            email=customer_data.get("email", ""),
-                            total_spent=float(customer_data.get("total_spent", 0)),
-                            created_at=created_at,
-                            tenant_id=self.tenant.id
-                        )
-                        self.db.add(customer)
-                        created_count += 1
-                        
+                    rows.append(spec.to_row(self.tenant.id, record))
                 except Exception as e:
-                    print(f"Error processing customer {customer_data.get('id', 'unknown')}: {e}")
+                    logger.warning("Error processing %s %s: %s", resource[:-1], record.get("id", "unknown"), e)
                     continue
-            
+                written.append(record)
+
+        with stage_timer(self.tenant.id, resource, "db_write"):
+            counts = bulk_upsert(
+                self.db,
+                spec.model,
+                rows,
+                conflict_columns=("tenant_id", spec.key),
+                update_columns=spec.update_columns,
+            )
+            if spec.after_write is not None and written:
+                spec.after_write(self.db, self.tenant.id, written)
+            if counts.created or counts.updated:
+                mark_changed(self.db, self.tenant.id)
+            if (counts.created or counts.updated) and resource in daily_stats_service.ROLLUPS:
+                # created_at is not updated on conflict, so the stored value decides the day
+                stored = self.db.execute(
+                    select(spec.model.created_at).where(
+                        spec.model.tenant_id == self.tenant.id,
+                        getattr(spec.model, spec.key).in_([row[spec.key] for row in rows]),
+                    )
+                ).scalars()
+                days = daily_stats_service.local_days(stored, self.tenant.timezone)
+                daily_stats_service.refresh_days(self.db, self.tenant, resource, days)
+        for outcome, count in counts._asdict().items():
+            INGEST_ROWS.labels(str(self.tenant.id), resource, outcome).inc(count)
+        return counts
+
+    def delete_records(self, resource: str, shopify_ids) -> int:
+        """Delete this tenant's rows for the given Shopify ids in one statement; the caller commits"""
+        spec = RESOURCES[resource]
+        deleted = self.db.execute(
+            delete(spec.model)
+            .where(
+                spec.model.tenant_id == self.tenant.id,
+                getattr(spec.model, spec.key).in_([str(shopify_id) for shopify_id in shopify_ids])
+            )
+            .returning(spec.model.created_at)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+        days = daily_stats_service.local_days(deleted, self.tenant.timezone)
+        daily_stats_service.refresh_days(self.db, self.tenant, resource, days)
+        if deleted:
+            mark_changed(self.db, self.tenant.id)
+        return len(deleted)
+
+    def _store_timezone(self, shop: dict):
+        """Keep the tenant's timezone in step with the shop's; dashboards bucket orders in it"""
+        shop_timezone = shop.get("iana_timezone")
+        if not shop_timezone:
+            return
+        # The tenant may come from another session (e.g. the request's auth lookup),
+        # and the change has to land in the one this service commits
+        self.tenant = self.db.get(tenant_model.Tenant, self.tenant.id)
+        if shop_timezone != self.tenant.timezone:
+            self.tenant.timezone = shop_timezone
+            # Rollup days are local days, so they all move with the timezone
+            daily_stats_service.rebuild(self.db, self.tenant)
+            mark_changed(self.db, self.tenant.id)
             self.db.commit()
-            return {
-                "status": "success",
-                "created": created_count,
-                "updated": updated_count,
-                "total_processed": len(customers),
-                "mode": "mock" if not settings.USE_SHOPIFY_API else "live"
-            }
-                
-        except Exception as e:
-            return {"status": "error", "message": f"Customers ingestion error: {str(e)}"}
 
     def test_connection(self):
         """
@@ -235,24 +690,23 @@ class IngestionService:
         try:
             if settings.USE_SHOPIFY_API:
                 # Real Shopify API call
-                url = f"{self.base_url}/shop.json"
-                response = requests.get(url, headers=self.headers, timeout=10)
-                
-                if response.status_code == 200:
-                    shop_data = response.json().get("shop", {})
-                    return {
-                        "status": "success",
-                        "shop_name": shop_data.get("name", "Unknown"),
-                        "shop_domain": shop_data.get("domain", "Unknown"),
-                        "plan": shop_data.get("plan_name", "Unknown"),
-                        "mode": "live"
-                    }
-                else:
-                    return {"status": "error", "message": f"Connection failed: {response.status_code}"}
+                try:
+                    shop_data = self.client.get_json("shop.json", timeout=10).get("shop", {})
+                except ShopifyAPIError as e:
+                    return {"status": "error", "message": f"Connection failed: {e.status_code}"}
+                self._store_timezone(shop_data)
+                return {
+                    "status": "success",
+                    "shop_name": shop_data.get("name", "Unknown"),
+                    "shop_domain": shop_data.get("domain", "Unknown"),
+                    "plan": shop_data.get("plan_name", "Unknown"),
+                    "mode": "live"
+                }
             else:
                 # Mock mode - return realistic shop data
                 shop_data = ShopifyMockFixtures.get_shop_response()
                 shop = shop_data.get("shop", {})
+                self._store_timezone(shop)
                 return {
                     "status": "success",
                     "shop_name": shop.get("name", "Xeno Demo Store"),
@@ -260,45 +714,6 @@ class IngestionService:
                     "plan": shop.get("plan_display_name", "Basic"),
                     "mode": "mock"
                 }
-                
+
         except Exception as e:
             return {"status": "error", "message": f"Connection test failed: {str(e)}"}
-
-    def _create_or_update_product(self, product: product_schema.ProductCreate):
-        db_product = self.db.query(product_model.Product).filter(
-            product_model.Product.shopify_product_id == product.shopify_product_id,
-            product_model.Product.tenant_id == self.tenant.id
-        ).first()
-        if db_product:
-            for key, value in product.dict().items():
-                setattr(db_product, key, value)
-        else:
-            db_product = product_model.Product(**product.dict())
-        self.db.add(db_product)
-        self.db.commit()
-
-    def _create_or_update_order(self, order: order_schema.OrderCreate):
-        db_order = self.db.query(order_model.Order).filter(
-            order_model.Order.shopify_order_id == order.shopify_order_id,
-            order_model.Order.tenant_id == self.tenant.id
-        ).first()
-        if db_order:
-            for key, value in order.dict().items():
-                setattr(db_order, key, value)
-        else:
-            db_order = order_model.Order(**order.dict())
-        self.db.add(db_order)
-        self.db.commit()
-
-    def _create_or_update_customer(self, customer: customer_schema.CustomerCreate):
-        db_customer = self.db.query(customer_model.Customer).filter(
-            customer_model.Customer.shopify_customer_id == customer.shopify_customer_id,
-            customer_model.Customer.tenant_id == self.tenant.id
-        ).first()
-        if db_customer:
-            for key, value in customer.dict().items():
-                setattr(db_customer, key, value)
-        else:
-            db_customer = customer_model.Customer(**customer.dict())
-        self.db.add(db_customer)
-        self.db.commit()
@@ -0,0 +1,111 @@
+"""
+Keyset-paginated listings of a tenant's orders, customers and products
+Rows come in (sort key, id) order and each page starts right after the last
+row of the previous one, whose position the opaque cursor carries. Every page
+is therefore an index range scan of page-size rows: a deep page costs what
+the first one does, and rows written in between neither shift nor repeat
+rows the way they would with OFFSET.
+
+Sort keys are limited to columns that lead a (tenant_id, ...) index. Rows
+whose sort key is NULL are left out of listings by that key.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, NamedTuple, Optional, Sequence
+from sqlalchemy import DateTime, and_, or_, select
+from sqlalchemy.orm import Session
+from app.models import customer as customer_model, order as order_model, product as product_model
+
+MAX_PAGE_SIZE = 250
+
+
+class Listing(NamedTuple):
+    model: type
+    sorts: Sequence[str]  # Columns a listing may be sorted by, each indexed after tenant_id
+    default_sort: str
+
+
+LISTINGS = {
+    "orders": Listing(order_model.Order, ("created_at",), "created_at"),
+    "customers": Listing(customer_model.Customer, ("total_spent", "created_at"), "total_spent"),
+    "products": Listing(product_model.Product, ("created_at",), "created_at"),
+}
+
+
+def encode_cursor(sort: str, descending: bool, value: Any, row_id: int) -> str:
+    """Opaque cursor positioned after (value, row_id) of a listing in the given order"""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort, "desc" if descending else "asc", value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, descending: bool, column) -> tuple:
+    """(value, row_id) from a cursor; ValueError if it is malformed or from a different sort"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, direction, value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if isinstance(column.type, DateTime):
+            value = datetime.fromisoformat(value)
+        row_id = int(row_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort or direction != ("desc" if descending else "asc"):
+        raise ValueError("Cursor belongs to a different sort order")
+    return value, row_id
+
+
+def list_page(
+    db: Session,
+    tenant_id: int,
+    resource: str,
+    sort: str = None,
+    descending: bool = True,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    filters: Optional[Dict[str, Any]] = None,
+) -> dict:
+    """
+    One page of a tenant's rows: {"items": [...], "next_cursor": str or None}
+    date_from/date_to bound created_at inclusively (naive UTC); filters are
+    column -> value equality matches, None values ignored.
+    Raises ValueError for an unknown sort, a page size out of range or a bad cursor.
+    """
+    listing = LISTINGS[resource]
+    model = listing.model
+    sort = sort or listing.default_sort
+    if sort not in listing.sorts:
+        raise ValueError(f"Cannot sort {resource} by {sort}")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    column = getattr(model, sort)
+
+    conditions = [model.tenant_id == tenant_id, column.isnot(None)]
+    if date_from:
+        conditions.append(model.created_at >= date_from)
+    if date_to:
+        conditions.append(model.created_at <= date_to)
+    for name, value in (filters or {}).items():
+        if value is not None:
+            conditions.append(getattr(model, name) == value)
+    if cursor:
+        value, row_id = decode_cursor(cursor, sort, descending, column)
+        if descending:
+            # The first bound alone is what the index range scan uses; the second breaks ties
+            conditions += [column <= value, or_(column < value, and_(column == value, model.id < row_id))]
+        else:
+            conditions += [column >= value, or_(column > value, and_(column == value, model.id > row_id))]
+
+    order_by = (column.desc(), model.id.desc()) if descending else (column.asc(), model.id.asc())
+    # One row past the page tells whether there is a next page
+    rows = db.execute(select(model).where(*conditions).order_by(*order_by).limit(limit + 1)).scalars().all()
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(sort, descending, getattr(last, sort), last.id)
+    return {"items": items, "next_cursor": next_cursor}
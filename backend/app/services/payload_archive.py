@@ -0,0 +1,64 @@
+"""
+Raw Shopify payload archive
+Every fetched page is appended, exactly as decoded, to a compressed
+append-only file per tenant and resource:
+
+    <PAYLOAD_ARCHIVE_DIR>/tenant_<id>/<resource>.jsonl.gz
+
+Each page is written as its own gzip member holding one JSON line, so appends
+never rewrite earlier data and the file stays readable with a plain gzip
+reader. The archive can be replayed through IngestionService without network
+access to rebuild tables or benchmark ingestion changes.
+"""
+
+import gzip
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List
+import msgspec
+from app.core.config import settings
+
+_locks: Dict[str, threading.Lock] = {}
+_locks_lock = threading.Lock()
+
+
+def _lock_for(path: str) -> threading.Lock:
+    with _locks_lock:
+        lock = _locks.get(path)
+        if lock is None:
+            lock = _locks[path] = threading.Lock()
+        return lock
+
+
+def archive_path(tenant_id: int, resource: str) -> str:
+    return os.path.join(settings.PAYLOAD_ARCHIVE_DIR, f"tenant_{tenant_id}", f"{resource}.jsonl.gz")
+
+
+def append_page(tenant_id: int, resource: str, records: List[dict]):
+    """Append one page as a self-contained gzip member (records may be dicts or decoded structs)"""
+    path = archive_path(tenant_id, resource)
+    line = msgspec.json.encode({
+        "archived_at": datetime.now(timezone.utc).isoformat(),
+        "records": records,
+    }) + b"\n"
+    member = gzip.compress(line, compresslevel=settings.PAYLOAD_ARCHIVE_COMPRESSLEVEL)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with _lock_for(path):
+        # One write() on an O_APPEND descriptor, so concurrent writers never interleave a member
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o640)
+        try:
+            os.write(fd, member)
+        finally:
+            os.close(fd)
+
+
+def iter_pages(tenant_id: int, resource: str) -> Iterator[List[dict]]:
+    """Yield archived pages in the order they were fetched, one page in memory at a time"""
+    path = archive_path(tenant_id, resource)
+    if not os.path.exists(path):
+        return
+    with gzip.open(path, "rb") as archive_file:
+        for line in archive_file:
+            yield msgspec.json.decode(line)["records"]
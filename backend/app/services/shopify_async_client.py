@@ -0,0 +1,99 @@
+"""
+Asyncio Shopify Admin REST API client
+Keeps one pooled keep-alive httpx.AsyncClient per store so concurrent fetches
+of several resources share connections instead of tying up threadpool workers
+"""
+
+import asyncio
+from typing import Dict
+import httpx
+from app.core.config import settings
+from app.core.metrics import record_rate_limit_wait, record_retry, stage_timer
+from app.models import tenant as tenant_model
+from app.services.shopify_client import MAX_PAGE_SIZE, ShopifyAPIError, error_message_for_status, next_page_params
+from app.services.shopify_decode import decode_page
+from app.services.shopify_rate_limiter import RETRYABLE_STATUS_CODES, backoff_delay, get_bucket, retry_delay
+
+# Connections per store; Shopify throttles per store, so a handful is plenty
+MAX_CONNECTIONS_PER_STORE = 4
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def get_store_client(store_url: str) -> httpx.AsyncClient:
+    """Return the shared connection pool for a store, creating it on first use"""
+    client = _clients.get(store_url)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS_PER_STORE,
+                max_keepalive_connections=MAX_CONNECTIONS_PER_STORE,
+            ),
+        )
+        _clients[store_url] = client
+    return client
+
+
+async def close_store_clients():
+    """Close every pooled store connection (called on application shutdown)"""
+    while _clients:
+        _, client = _clients.popitem()
+        await client.aclose()
+
+
+class AsyncShopifyClient:
+    def __init__(self, tenant: tenant_model.Tenant):
+        self.tenant_id = tenant.id
+        self.base_url = f"{settings.SHOPIFY_API_SCHEME}://{tenant.shopify_store_url}/admin/api/{settings.SHOPIFY_API_VERSION}"
+        self.headers = {"X-Shopify-Access-Token": tenant.shopify_access_token}
+        self.http = get_store_client(tenant.shopify_store_url)
+        # Same bucket as the sync client, so throttle state is shared across transports
+        self.bucket = get_bucket(tenant.shopify_store_url)
+
+    async def get(self, url: str, params: dict = None, resource: str = "other") -> httpx.Response:
+        """Async counterpart of ShopifyClient.get with the same pacing, retry policy and metrics"""
+        for attempt in range(settings.SHOPIFY_MAX_RETRIES + 1):
+            last_attempt = attempt == settings.SHOPIFY_MAX_RETRIES
+            wait = self.bucket.reserve()
+            record_rate_limit_wait(self.tenant_id, resource, wait)
+            await asyncio.sleep(wait)
+            try:
+                with stage_timer(self.tenant_id, resource, "fetch"):
+                    response = await self.http.get(url, params=params, headers=self.headers)
+            except httpx.TransportError as e:
+                if last_attempt:
+                    raise
+                record_retry(self.tenant_id, resource, "timeout" if isinstance(e, httpx.TimeoutException) else "connection")
+                await asyncio.sleep(backoff_delay(attempt))
+                continue
+
+            self.bucket.observe(response.headers)
+            if response.status_code in RETRYABLE_STATUS_CODES and not last_attempt:
+                delay = retry_delay(response.status_code, response.headers, attempt, self.bucket)
+                record_retry(self.tenant_id, resource, str(response.status_code))
+                if response.status_code == 429:
+                    record_rate_limit_wait(self.tenant_id, resource, delay)
+                await asyncio.sleep(delay)
+                continue
+            if response.status_code != 200:
+                raise ShopifyAPIError(response.status_code, error_message_for_status(response.status_code))
+            return response
+
+    async def iter_pages(self, resource: str, params: dict = None):
+        """
+        Async counterpart of ShopifyClient.iter_pages: yields one page of records
+        at a time and follows Link rel="next" page_info cursors
+        """
+        query = {"limit": MAX_PAGE_SIZE}
+        query.update(params or {})
+        url = f"{self.base_url}/{resource}.json"
+
+        while url:
+            response = await self.get(url, params=query, resource=resource)
+            with stage_timer(self.tenant_id, resource, "decode"):
+                records = decode_page(resource, response.content)
+            yield records
+
+            url = response.links.get("next", {}).get("url")
+            query = next_page_params(url, query)
@@ -0,0 +1,119 @@
+"""
+Shopify Admin REST API client
+Follows cursor-based pagination (Link: rel="next" with page_info) so callers
+can stream a resource page by page instead of loading it all at once, and
+paces/retries requests through the shared per-store leaky bucket
+"""
+
+import time
+import requests
+from app.core.config import settings
+from app.core.metrics import record_rate_limit_wait, record_retry, stage_timer
+from app.models import tenant as tenant_model
+from app.services.shopify_decode import decode_page
+from app.services.shopify_rate_limiter import RETRYABLE_STATUS_CODES, backoff_delay, get_bucket, retry_delay
+
+# Largest page size Shopify accepts for REST list endpoints
+MAX_PAGE_SIZE = 250
+
+
+class ShopifyAPIError(Exception):
+    """Raised when Shopify answers with a non-200 status"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+def error_message_for_status(status_code: int) -> str:
+    if status_code == 401:
+        return "Invalid Shopify access token"
+    if status_code == 429:
+        return "Rate limit exceeded. Please try again later."
+    return f"Shopify API error: {status_code}"
+
+
+def next_page_params(next_url: str, query: dict):
+    """
+    Params to send with a next link. The link already carries page_info and
+    limit, and Shopify rejects any other filter alongside page_info, but the
+    fields projection is allowed and is re-sent if the link dropped it.
+    """
+    fields = (query or {}).get("fields")
+    if next_url and fields and "fields=" not in next_url:
+        return {"fields": fields}
+    return None
+
+
+class ShopifyClient:
+    def __init__(self, tenant: tenant_model.Tenant, timeout: int = 30):
+        self.timeout = timeout
+        self.tenant_id = tenant.id
+        self.base_url = f"{settings.SHOPIFY_API_SCHEME}://{tenant.shopify_store_url}/admin/api/{settings.SHOPIFY_API_VERSION}"
+        # A session keeps the TCP/TLS connection to the store alive across pages
+        self.session = requests.Session()
+        self.session.headers.update({
+            "X-Shopify-Access-Token": tenant.shopify_access_token
+        })
+        self.bucket = get_bucket(tenant.shopify_store_url)
+
+    def get(self, url: str, params: dict = None, timeout: int = None, resource: str = "other") -> requests.Response:
+        """
+        GET with leaky-bucket pacing. 429, 5xx, timeouts, dropped connections and
+        responses cut off mid-body are retried with jittered backoff up to
+        SHOPIFY_MAX_RETRIES times.
+        resource only labels the request's metrics.
+        """
+        for attempt in range(settings.SHOPIFY_MAX_RETRIES + 1):
+            last_attempt = attempt == settings.SHOPIFY_MAX_RETRIES
+            wait = self.bucket.reserve()
+            record_rate_limit_wait(self.tenant_id, resource, wait)
+            time.sleep(wait)
+            try:
+                with stage_timer(self.tenant_id, resource, "fetch"):
+                    response = self.session.get(url, params=params, timeout=timeout or self.timeout)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError,
+                    requests.exceptions.ChunkedEncodingError) as e:
+                if last_attempt:
+                    raise
+                record_retry(self.tenant_id, resource, "timeout" if isinstance(e, requests.exceptions.Timeout) else "connection")
+                time.sleep(backoff_delay(attempt))
+                continue
+
+            self.bucket.observe(response.headers)
+            if response.status_code in RETRYABLE_STATUS_CODES and not last_attempt:
+                delay = retry_delay(response.status_code, response.headers, attempt, self.bucket)
+                record_retry(self.tenant_id, resource, str(response.status_code))
+                if response.status_code == 429:
+                    record_rate_limit_wait(self.tenant_id, resource, delay)
+                time.sleep(delay)
+                continue
+            if response.status_code != 200:
+                raise ShopifyAPIError(response.status_code, error_message_for_status(response.status_code))
+            return response
+
+    def get_json(self, path: str, params: dict = None, timeout: int = None) -> dict:
+        return self.get(f"{self.base_url}/{path}", params=params, timeout=timeout, resource=path.split(".")[0]).json()
+
+    def iter_pages(self, resource: str, params: dict = None):
+        """
+        Yield the records of a list endpoint one page at a time, decoded into
+        the projected structs of shopify_decode.
+        The next page is only requested once the caller has consumed the current one.
+        """
+        query = {"limit": MAX_PAGE_SIZE}
+        query.update(params or {})
+        url = f"{self.base_url}/{resource}.json"
+
+        while url:
+            response = self.get(url, params=query, resource=resource)
+            with stage_timer(self.tenant_id, resource, "decode"):
+                records = decode_page(resource, response.content)
+            yield records
+
+            url = response.links.get("next", {}).get("url")
+            query = next_page_params(url, query)
+
+    def close(self):
+        self.session.close()
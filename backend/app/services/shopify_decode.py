@@ -0,0 +1,104 @@
+"""
+Projected decoding of Shopify list responses
+Shopify order objects carry addresses, client details, price sets and more,
+while ingestion stores a handful of columns. Requests ask Shopify for only
+those fields (fields=...), and response bodies are decoded with msgspec
+straight into typed structs that declare just the stored fields; any other
+keys are skipped by the decoder without building Python objects for them.
+"""
+
+from typing import Dict, List, Optional
+import msgspec
+
+
+class ShopifyRecord(msgspec.Struct):
+    """
+    Base for decoded records. get() and [] mirror dict access so the row
+    builders in IngestionService accept structs and plain dicts (mock fixtures,
+    webhooks, bulk exports) alike.
+    """
+
+    def get(self, field: str, default=None):
+        return getattr(self, field, default)
+
+    def __getitem__(self, field: str):
+        try:
+            return getattr(self, field)
+        except AttributeError:
+            raise KeyError(field)
+
+
+class ProductRecord(ShopifyRecord):
+    id: int
+    title: Optional[str] = ""
+    vendor: Optional[str] = ""
+    product_type: Optional[str] = ""
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+
+
+class CustomerRecord(ShopifyRecord):
+    id: int
+    first_name: Optional[str] = ""
+    last_name: Optional[str] = ""
+    email: Optional[str] = ""
+    total_spent: Optional[str] = "0"
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+
+
+class OrderCustomerRef(ShopifyRecord):
+    id: int
+
+
+class LineItemRecord(ShopifyRecord):
+    id: int
+    product_id: Optional[int] = None
+    variant_id: Optional[int] = None
+    title: Optional[str] = ""
+    sku: Optional[str] = None
+    quantity: Optional[int] = 0
+    price: Optional[str] = "0"
+
+
+class OrderRecord(ShopifyRecord):
+    id: int
+    total_price: Optional[str] = "0"
+    currency: Optional[str] = "USD"
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    # fields= only projects top-level keys; nested keys beyond these are skipped while decoding
+    customer: Optional[OrderCustomerRef] = None
+    line_items: List[LineItemRecord] = []
+
+
+class ProductsPage(msgspec.Struct):
+    products: List[ProductRecord] = []
+
+
+class CustomersPage(msgspec.Struct):
+    customers: List[CustomerRecord] = []
+
+
+class OrdersPage(msgspec.Struct):
+    orders: List[OrderRecord] = []
+
+
+# Decoders are reusable and thread-safe; building them once avoids per-page setup
+_DECODERS = {
+    "products": msgspec.json.Decoder(ProductsPage),
+    "customers": msgspec.json.Decoder(CustomersPage),
+    "orders": msgspec.json.Decoder(OrdersPage),
+}
+
+# Top-level fields requested from Shopify for each resource (fields= parameter)
+RESOURCE_FIELDS: Dict[str, str] = {
+    "products": ",".join(ProductRecord.__struct_fields__),
+    "customers": ",".join(CustomerRecord.__struct_fields__),
+    "orders": ",".join(OrderRecord.__struct_fields__),
+}
+
+
+def decode_page(resource: str, body: bytes) -> List[ShopifyRecord]:
+    """Decode a list-endpoint response body into the records of that page"""
+    return getattr(_DECODERS[resource].decode(body), resource)
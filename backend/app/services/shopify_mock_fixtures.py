@@ -29,6 +29,7 @@ class ShopifyMockFixtures:
                 "currency": "USD",
                 "customer_email": "customers@xenodemostore.com",
                 "timezone": "(GMT-08:00) America/Los_Angeles",
+                "iana_timezone": "America/Los_Angeles",
                 "plan_name": "Basic Shopify",
                 "plan_display_name": "Basic",
                 "shop_owner": "Demo Store Owner",
@@ -0,0 +1,112 @@
+"""
+Shopify REST rate limiting
+Mirrors Shopify's per-store leaky bucket on the client so requests are paced
+at the sustainable rate instead of bouncing off 429s, and provides the retry
+policy (jittered exponential backoff, Retry-After) shared by the sync and
+async transports
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Optional
+from app.core.config import settings
+
+# Shopify's standard REST bucket: 40 requests, leaking 2 per second
+DEFAULT_BUCKET_SIZE = 40
+DEFAULT_LEAK_RATE = 2.0
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class LeakyBucket:
+    """
+    Thread-safe pacing for one store, modelled as a generic cell rate algorithm:
+    every request adds one unit, the bucket drains at leak_rate units per second,
+    and a request must wait once the bucket would exceed its capacity.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_BUCKET_SIZE, leak_rate: float = DEFAULT_LEAK_RATE):
+        self._lock = threading.Lock()
+        self.capacity = capacity
+        self.leak_rate = leak_rate
+        # Time at which the bucket will be empty again if no more requests arrive
+        self._empty_at = time.monotonic()
+        self._blocked_until = 0.0
+
+    def _tolerance(self) -> float:
+        # Keep a couple of slots free for other apps calling the same store
+        usable = max(1, self.capacity - settings.SHOPIFY_BUCKET_HEADROOM)
+        return (usable - 1) / self.leak_rate
+
+    def reserve(self) -> float:
+        """Claim a slot and return how many seconds to wait before sending"""
+        with self._lock:
+            now = time.monotonic()
+            empty_at = max(self._empty_at, now)
+            send_at = max(empty_at - self._tolerance(), self._blocked_until, now)
+            self._empty_at = max(empty_at, send_at) + 1 / self.leak_rate
+            return send_at - now
+
+    def observe(self, headers):
+        """Resynchronise with the X-Shopify-Shop-Api-Call-Limit header ("used/capacity")"""
+        call_limit = headers.get("X-Shopify-Shop-Api-Call-Limit")
+        if not call_limit:
+            return
+        try:
+            used, capacity = (int(part) for part in call_limit.split("/"))
+        except ValueError:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self.capacity = capacity
+            # Only ever move towards the stricter estimate: the server also counts
+            # calls made by other processes and apps against this store
+            self._empty_at = max(self._empty_at, now + used / self.leak_rate)
+
+    def block_for(self, seconds: float):
+        """Pause every caller sharing this bucket, e.g. after a 429 with Retry-After"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+_buckets: Dict[str, LeakyBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(store_url: str) -> LeakyBucket:
+    """Buckets are per store and shared by every ingest job in the process"""
+    with _buckets_lock:
+        bucket = _buckets.get(store_url)
+        if bucket is None:
+            bucket = _buckets[store_url] = LeakyBucket()
+        return bucket
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for the given zero-based retry attempt"""
+    ceiling = min(settings.SHOPIFY_BACKOFF_MAX_SECONDS, settings.SHOPIFY_BACKOFF_BASE_SECONDS * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+
+def retry_after_seconds(headers) -> Optional[float]:
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+def retry_delay(status_code: int, headers, attempt: int, bucket: LeakyBucket) -> float:
+    """
+    How long to wait before retrying a retryable response.
+    A 429 honours Retry-After and throttles every caller of the store, not just this one.
+    """
+    delay = retry_after_seconds(headers)
+    if delay is None:
+        delay = backoff_delay(attempt)
+    if status_code == 429:
+        bucket.block_for(delay)
+    return delay
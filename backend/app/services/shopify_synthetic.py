@@ -0,0 +1,309 @@
+"""
+Seeded synthetic Shopify store
+Generates any number of products, customers and orders lazily and
+deterministically: every record is derived from (seed, resource, index) alone,
+so a record can be rebuilt at any offset without generating the ones before it
+and the same seed always yields the same store.
+
+The data follows shapes that matter for ingestion and dashboards:
+  - order values are log-normal (many small baskets, a long tail of big ones)
+    and equal the sum of their line items
+  - a minority of early customers place most of the repeat orders; a few
+    orders are guest checkouts without a customer
+  - order volume grows over the window, peaks around Black Friday and the
+    holidays, and is higher at weekends
+Records are served in Shopify-shaped pages with opaque page_info cursors, the
+same way the REST list endpoints paginate.
+"""
+
+import base64
+import bisect
+import json
+import math
+import random
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+from app.core.config import settings
+
+# Shopify-style id ranges per resource; each seed gets its own block of ids
+ID_BASES = {
+    "products": 1_000_000_000_000,
+    "customers": 5_000_000_000_000,
+    "orders": 6_000_000_000_000,
+    "line_items": 9_000_000_000_000,
+}
+IDS_PER_SEED = 100_000_000
+
+# Upper bound on updated_at - created_at per resource, used to skip straight to
+# the first record an updated_at_min filter can match
+MAX_UPDATE_LAG = {
+    "products": None,  # Products can be edited at any time; filters scan the catalogue
+    "customers": timedelta(days=30),
+    "orders": timedelta(days=10),
+}
+
+FIRST_NAMES = ["Emma", "Liam", "Olivia", "Noah", "Ava", "Mateo", "Sophia", "Arjun", "Mia", "Lucas",
+               "Priya", "Ethan", "Chloe", "Kenji", "Isabella", "Omar", "Grace", "Leo", "Zara", "Daniel"]
+LAST_NAMES = ["Johnson", "Smith", "Garcia", "Patel", "Kim", "Brown", "Martinez", "Nguyen", "Lee", "Walker",
+              "Davis", "Singh", "Lopez", "Clark", "Wilson", "Khan", "Taylor", "Moore", "Hall", "Young"]
+CATALOGUE = [
+    ("Electronics", ["Wireless Earbuds", "Fitness Tracker", "Bluetooth Speaker", "Phone Charger", "Smart Lamp"]),
+    ("Apparel", ["Cotton T-Shirt", "Denim Jacket", "Running Shorts", "Wool Beanie", "Linen Shirt"]),
+    ("Home & Kitchen", ["Ceramic Mug", "Chef Knife", "Scented Candle", "Cutting Board", "Throw Blanket"]),
+    ("Beauty", ["Face Serum", "Lip Balm", "Hair Oil", "Sheet Mask", "Body Lotion"]),
+    ("Sports", ["Yoga Mat", "Water Bottle", "Resistance Bands", "Jump Rope", "Gym Bag"]),
+]
+VENDORS = ["Northwind", "Acme Goods", "Blue Harbor", "Studio Nine", "Evergreen", "Kite & Co"]
+CUSTOMER_BASE_SHARE = 0.1  # Customers who already exist when the window opens
+LOYAL_ORDER_SHARE = 0.4  # Orders placed by the earliest fifth of customers
+WEEKDAY_WEIGHTS = (1.0, 0.95, 0.95, 1.0, 1.1, 1.3, 1.25)  # Monday .. Sunday
+
+
+def _day_weight(day: datetime, progress: float) -> float:
+    """Relative order volume of a day: growth trend x holiday season x weekday"""
+    day_of_year = day.timetuple().tm_yday
+    season = 1.0 + 0.8 * math.exp(-((day_of_year - 332) / 6.0) ** 2) + 0.5 * math.exp(-((day_of_year - 352) / 10.0) ** 2)
+    return (1.0 + progress) * season * WEEKDAY_WEIGHTS[day.weekday()]
+
+
+def _isoformat(moment: datetime) -> str:
+    return moment.isoformat().replace("+00:00", "Z")
+
+
+def encode_page_info(offset: int, updated_at_min: Optional[str]) -> str:
+    """Opaque cursor; like Shopify's, it carries the filter so later pages need no other params"""
+    payload = json.dumps({"o": offset, "u": updated_at_min}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_page_info(page_info: str) -> Tuple[int, Optional[str]]:
+    padded = page_info + "=" * (-len(page_info) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return int(payload["o"]), payload.get("u")
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid page_info cursor")
+
+
+class SyntheticStore:
+    def __init__(self, seed: int = 0, products: int = 100, customers: int = 1000, orders: int = 10000,
+                 days: int = 365, end: datetime = None):
+        self.seed = seed
+        self.counts = {"products": products, "customers": customers, "orders": orders}
+        # Pinned to midnight UTC so a seed reproduces the same store all day
+        self.end = end or datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        self.start = self.end - timedelta(days=days)
+        self._id_offset = (seed % 10_000) * IDS_PER_SEED
+
+        # Cumulative volume per day; inverting it spreads record indexes over the
+        # window with the seasonal shape while keeping created_at monotonic in index
+        self._cumulative = []
+        total = 0.0
+        for day in range(days):
+            total += _day_weight(self.start + timedelta(days=day), day / days)
+            self._cumulative.append(total)
+
+        self.record = lru_cache(maxsize=4096)(self._record)
+
+    # ---- time and randomness -------------------------------------------------
+
+    def _rng(self, resource: str, index: int) -> random.Random:
+        return random.Random(f"{self.seed}:{resource}:{index}")
+
+    def _moment(self, fraction: float) -> datetime:
+        """Point in the window below which `fraction` of the seasonal volume falls"""
+        target = fraction * self._cumulative[-1]
+        day = min(bisect.bisect_left(self._cumulative, target), len(self._cumulative) - 1)
+        previous = self._cumulative[day - 1] if day else 0.0
+        within = (target - previous) / (self._cumulative[day] - previous)
+        return self.start + timedelta(days=day + within)
+
+    def created_at(self, resource: str, index: int) -> datetime:
+        if resource == "products":
+            # The catalogue exists early on and is refreshed over time
+            return self.start + (self.end - self.start) * (0.1 * index / max(self.counts["products"], 1))
+        if resource == "customers":
+            # The store opens the window with an existing base of customers
+            share = (index + 0.5) / self.counts[resource]
+            return self._moment(max(share - CUSTOMER_BASE_SHARE, 0.0) / (1.0 - CUSTOMER_BASE_SHARE))
+        return self._moment((index + 0.5) / self.counts[resource])
+
+    def _updated_at(self, rng: random.Random, resource: str, created_at: datetime) -> datetime:
+        if resource == "products":
+            lag = (self.end - created_at) * rng.random() ** 3
+        elif rng.random() < 0.8:
+            lag = timedelta(minutes=rng.randint(0, 30))
+        else:
+            lag = MAX_UPDATE_LAG[resource] * rng.random()
+        return min(created_at + lag, self.end)
+
+    def gid(self, resource: str, index: int) -> int:
+        return ID_BASES[resource] + self._id_offset + index + 1
+
+    # ---- records ---------------------------------------------------------------
+
+    def _record(self, resource: str, index: int) -> dict:
+        return getattr(self, f"_{resource[:-1]}")(index)
+
+    def _product(self, index: int) -> dict:
+        rng = self._rng("products", index)
+        product_type, names = CATALOGUE[index % len(CATALOGUE)]
+        created_at = self.created_at("products", index)
+        product_id = self.gid("products", index)
+        price = round(min(max(rng.lognormvariate(3.4, 0.7), 4.0), 900.0), 2)
+        return {
+            "id": product_id,
+            "title": f"{rng.choice(names)} {index + 1}",
+            "vendor": rng.choice(VENDORS),
+            "product_type": product_type,
+            "handle": f"product-{index + 1}",
+            "status": "active",
+            "created_at": _isoformat(created_at),
+            "updated_at": _isoformat(self._updated_at(rng, "products", created_at)),
+            "admin_graphql_api_id": f"gid://shopify/Product/{product_id}",
+            "variants": [{
+                "id": product_id + 1_000_000_000_000,
+                "product_id": product_id,
+                "price": f"{price:.2f}",
+                "sku": f"SKU-{index + 1:06d}",
+            }],
+        }
+
+    def _customer(self, index: int) -> dict:
+        rng = self._rng("customers", index)
+        first_name = rng.choice(FIRST_NAMES)
+        last_name = rng.choice(LAST_NAMES)
+        created_at = self.created_at("customers", index)
+        customer_id = self.gid("customers", index)
+        # Mirrors the repeat-buyer skew in _order: earlier customers buy far more often
+        loyalty = 3.0 if index < self.counts["customers"] // 5 else 1.0
+        orders_count = 1 + int(rng.expovariate(1.0) * 8 * loyalty)
+        return {
+            "id": customer_id,
+            "email": f"{first_name.lower()}.{last_name.lower()}.{index + 1}@example.com",
+            "first_name": first_name,
+            "last_name": last_name,
+            "state": "enabled",
+            "orders_count": orders_count,
+            "total_spent": f"{orders_count * rng.lognormvariate(4.0, 0.5):.2f}",
+            "currency": "USD",
+            "verified_email": True,
+            "created_at": _isoformat(created_at),
+            "updated_at": _isoformat(self._updated_at(rng, "customers", created_at)),
+            "admin_graphql_api_id": f"gid://shopify/Customer/{customer_id}",
+        }
+
+    def _order(self, index: int) -> dict:
+        rng = self._rng("orders", index)
+        fraction = (index + 0.5) / self.counts["orders"]
+        created_at = self._moment(fraction)
+        order_id = self.gid("orders", index)
+
+        customer = None
+        if rng.random() >= 0.05:
+            # Only customers who already exist at this point in the window can
+            # order, and a loyal cohort of the earliest fifth places many of them
+            share = CUSTOMER_BASE_SHARE + (1.0 - CUSTOMER_BASE_SHARE) * fraction
+            available = max(1, int(share * self.counts["customers"]))
+            cohort = available // 5 if rng.random() < LOYAL_ORDER_SHARE else available
+            customer_index = min(int(max(cohort, 1) * rng.random()), self.counts["customers"] - 1)
+            customer_record = self.record("customers", customer_index)
+            customer = {key: customer_record[key] for key in ("id", "email", "first_name", "last_name")}
+
+        line_items = []
+        subtotal = 0.0
+        items = 1 + int(rng.expovariate(1.5))
+        for position in range(min(items, 6)):
+            # Popularity follows a power law across the catalogue
+            product_index = int(self.counts["products"] * rng.random() ** 2)
+            product = self.record("products", product_index)
+            variant = product["variants"][0]
+            quantity = 1 + int(rng.expovariate(2.0))
+            subtotal += quantity * float(variant["price"])
+            line_items.append({
+                "id": self.gid("line_items", index * 8 + position),
+                "product_id": product["id"],
+                "variant_id": variant["id"],
+                "title": product["title"],
+                "name": product["title"],
+                "sku": variant["sku"],
+                "quantity": quantity,
+                "price": variant["price"],
+            })
+
+        return {
+            "id": order_id,
+            "name": f"#{1001 + index}",
+            "email": customer["email"] if customer else f"guest{index + 1}@example.com",
+            "currency": "USD",
+            "financial_status": "paid",
+            "subtotal_price": f"{subtotal:.2f}",
+            "total_price": f"{subtotal:.2f}",
+            "created_at": _isoformat(created_at),
+            "updated_at": _isoformat(self._updated_at(rng, "orders", created_at)),
+            "customer": customer,
+            "line_items": line_items,
+            "admin_graphql_api_id": f"gid://shopify/Order/{order_id}",
+        }
+
+    # ---- pagination ----------------------------------------------------------
+
+    def _first_candidate(self, resource: str, updated_at_min: Optional[datetime]) -> int:
+        """Lowest index whose updated_at can reach updated_at_min (created_at is monotonic)"""
+        lag = MAX_UPDATE_LAG[resource]
+        if updated_at_min is None or lag is None:
+            return 0
+        threshold = updated_at_min - lag
+        low, high = 0, self.counts[resource]
+        while low < high:
+            middle = (low + high) // 2
+            if self.created_at(resource, middle) < threshold:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def page(self, resource: str, limit: int = 250, page_info: str = None,
+             updated_at_min: str = None) -> Tuple[List[dict], Optional[str]]:
+        """One page of records and the page_info of the next page (None on the last one)"""
+        if page_info:
+            offset, updated_at_min = decode_page_info(page_info)
+        else:
+            offset = None
+        minimum = None
+        if updated_at_min:
+            minimum = datetime.fromisoformat(updated_at_min.replace("Z", "+00:00"))
+            if minimum.tzinfo is None:
+                minimum = minimum.replace(tzinfo=timezone.utc)
+        if offset is None:
+            offset = self._first_candidate(resource, minimum)
+
+        records = []
+        total = self.counts[resource]
+        while offset < total and len(records) < limit:
+            record = self.record(resource, offset)
+            offset += 1
+            if minimum is None or datetime.fromisoformat(record["updated_at"].replace("Z", "+00:00")) >= minimum:
+                records.append(record)
+        return records, (encode_page_info(offset, updated_at_min) if offset < total else None)
+
+    def iter_pages(self, resource: str, params: dict = None, limit: int = 250) -> Iterator[List[dict]]:
+        """Walk every page of a resource by following page_info cursors"""
+        params = params or {}
+        records, page_info = self.page(resource, limit=limit, updated_at_min=params.get("updated_at_min"))
+        yield records
+        while page_info:
+            records, page_info = self.page(resource, limit=limit, page_info=page_info)
+            yield records
+
+
+def store_for_tenant(tenant_id: int) -> SyntheticStore:
+    """The synthetic store mock mode serves for a tenant; each tenant gets its own seed"""
+    return SyntheticStore(
+        seed=settings.SYNTHETIC_SEED + tenant_id,
+        products=settings.SYNTHETIC_PRODUCTS,
+        customers=settings.SYNTHETIC_CUSTOMERS,
+        orders=settings.SYNTHETIC_ORDERS,
+        days=settings.SYNTHETIC_DAYS,
+    )
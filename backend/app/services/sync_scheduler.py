@@ -0,0 +1,223 @@
+"""
+Fleet-wide scheduled sync
+Walks every tenant on a fixed interval and syncs each resource with a global
+concurrency cap and a per-store cap. Work is split into (tenant, resource)
+tasks dispatched round-robin, least recently synced tenants first, so a huge
+tenant occupies at most SYNC_PER_STORE_CONCURRENCY workers and cannot starve
+the rest of the fleet. Each tenant's run is recorded in the sync_run table.
+
+The scheduler keeps its state in memory, so enable it in one process only.
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import List, Tuple
+from sqlalchemy import func
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models import tenant as tenant_model, sync_run as sync_run_model
+from app.services import tenant_service
+from app.services.ingestion_service import IngestionService
+
+logger = logging.getLogger(__name__)
+
+SYNC_SUCCEEDED = "succeeded"
+SYNC_PARTIAL = "partial"
+SYNC_FAILED = "failed"
+
+
+class _TenantRun:
+    """Aggregates the per-resource results of one tenant within a cycle"""
+
+    def __init__(self, tenant_id: int, resources: int):
+        self._lock = threading.Lock()
+        self.tenant_id = tenant_id
+        self.remaining = resources
+        self.started_at = None
+        self._started_monotonic = None
+        self.pages = 0
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.processed = 0
+        self.succeeded = 0
+        self.errors = []
+
+    def start(self):
+        with self._lock:
+            if self.started_at is None:
+                self.started_at = datetime.now(timezone.utc)
+                self._started_monotonic = time.monotonic()
+
+    def add(self, resource: str, result: dict) -> bool:
+        """Fold in one resource result; returns True once the tenant is complete"""
+        with self._lock:
+            self.pages += result.get("pages", 0)
+            self.created += result.get("created", 0)
+            self.updated += result.get("updated", 0)
+            self.unchanged += result.get("unchanged", 0)
+            self.processed += result.get("total_processed", 0)
+            if result.get("status") == "success":
+                self.succeeded += 1
+            else:
+                self.errors.append(f"{resource}: {result.get('message', 'unknown error')}")
+            self.remaining -= 1
+            return self.remaining == 0
+
+    def to_model(self) -> sync_run_model.SyncRun:
+        if not self.errors:
+            status = SYNC_SUCCEEDED
+        elif self.succeeded:
+            status = SYNC_PARTIAL
+        else:
+            status = SYNC_FAILED
+        return sync_run_model.SyncRun(
+            tenant_id=self.tenant_id,
+            trigger="scheduler",
+            status=status,
+            started_at=self.started_at,
+            finished_at=datetime.now(timezone.utc),
+            duration_seconds=round(time.monotonic() - self._started_monotonic, 3),
+            pages=self.pages,
+            rows_created=self.created,
+            rows_updated=self.updated,
+            rows_unchanged=self.unchanged,
+            rows_processed=self.processed,
+            error="\n".join(self.errors) or None,
+        )
+
+
+class SyncScheduler:
+    def __init__(self, interval_seconds: int, max_concurrency: int, per_store_concurrency: int):
+        self.interval_seconds = interval_seconds
+        self.max_concurrency = max_concurrency
+        self.per_store_concurrency = per_store_concurrency
+        # Dispatch order of each tenant's resources within a cycle; customers go
+        # first so most new orders can be linked to their customer as they are written
+        self.resources = ("customers", "products", "orders")
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+        self._executor = None
+        self._active = 0
+        self._store_active = defaultdict(int)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="sync")
+        self._thread = threading.Thread(target=self._loop, name="sync-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Scheduled sync cycle failed")
+            # Cycles never overlap: the next one starts an interval after this one began,
+            # or immediately if this one overran the interval
+            self._stop.wait(max(0.0, self.interval_seconds - (time.monotonic() - started)))
+
+    def run_once(self):
+        """Sync every tenant once and block until all of their tasks have finished"""
+        tenants = self._load_tenants()
+        runs = {tenant_id: _TenantRun(tenant_id, len(self.resources)) for tenant_id, _ in tenants}
+        # Resource-major order interleaves tenants: every tenant gets its first
+        # resource dispatched before anyone gets a second one
+        pending = deque(
+            (tenant_id, store_url, resource)
+            for resource in self.resources
+            for tenant_id, store_url in tenants
+        )
+
+        with self._cond:
+            while (pending or self._active) and not self._stop.is_set():
+                task = self._take_eligible(pending)
+                if task is None:
+                    self._cond.wait()
+                    continue
+                tenant_id, store_url, resource = task
+                self._active += 1
+                self._store_active[store_url] += 1
+                self._executor.submit(self._run_task, runs[tenant_id], store_url, resource)
+
+    def _take_eligible(self, pending: deque):
+        """Pop the first task whose store is under its cap, if a global slot is free"""
+        if self._active >= self.max_concurrency:
+            return None
+        for index, task in enumerate(pending):
+            if self._store_active[task[1]] < self.per_store_concurrency:
+                del pending[index]
+                return task
+        return None
+
+    def _load_tenants(self) -> List[Tuple[int, str]]:
+        """Tenant ids and store URLs, least recently synced (or never synced) first"""
+        db = SessionLocal()
+        try:
+            last_run = db.query(
+                sync_run_model.SyncRun.tenant_id,
+                func.max(sync_run_model.SyncRun.finished_at).label("finished_at")
+            ).group_by(sync_run_model.SyncRun.tenant_id).subquery()
+            rows = db.query(tenant_model.Tenant.id, tenant_model.Tenant.shopify_store_url).outerjoin(
+                last_run, last_run.c.tenant_id == tenant_model.Tenant.id
+            ).order_by(last_run.c.finished_at.asc().nullsfirst(), tenant_model.Tenant.id).all()
+            return [(tenant_id, store_url) for tenant_id, store_url in rows]
+        finally:
+            db.close()
+
+    def _run_task(self, run: _TenantRun, store_url: str, resource: str):
+        try:
+            run.start()
+            try:
+                result = self._sync_resource(run.tenant_id, resource)
+            except Exception as e:
+                result = {"status": "error", "message": f"{resource.capitalize()} ingestion error: {str(e)}"}
+            if run.add(resource, result):
+                self._record_run(run)
+        except Exception:
+            logger.exception("Failed to record scheduled sync for tenant %s", run.tenant_id)
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._store_active[store_url] -= 1
+                self._cond.notify_all()
+
+    def _sync_resource(self, tenant_id: int, resource: str) -> dict:
+        db = SessionLocal()
+        try:
+            tenant = tenant_service.get_tenant(db, tenant_id)
+            if tenant is None:
+                return {"status": "error", "message": f"Tenant {tenant_id} not found"}
+            return getattr(IngestionService(db, tenant), f"ingest_{resource}")()
+        finally:
+            db.close()
+
+    def _record_run(self, run: _TenantRun):
+        db = SessionLocal()
+        try:
+            db.add(run.to_model())
+            db.commit()
+        finally:
+            db.close()
+
+
+sync_scheduler = SyncScheduler(
+    interval_seconds=settings.SYNC_INTERVAL_SECONDS,
+    max_concurrency=settings.SYNC_MAX_CONCURRENCY,
+    per_store_concurrency=settings.SYNC_PER_STORE_CONCURRENCY,
+)
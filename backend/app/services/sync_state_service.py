@@ -0,0 +1,36 @@
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.models import sync_state as sync_state_model
+
+def get_watermark(db: Session, tenant_id: int, resource: str) -> Optional[datetime]:
+    state = db.query(sync_state_model.SyncState).filter(
+        sync_state_model.SyncState.tenant_id == tenant_id,
+        sync_state_model.SyncState.resource == resource
+    ).first()
+    return state.last_updated_at if state else None
+
+def set_watermark(db: Session, tenant_id: int, resource: str, last_updated_at: Optional[datetime]):
+    """
+    Record a successful sync. The watermark never moves backwards, and a run
+    that saw no records (last_updated_at=None) keeps the previous value since
+    GREATEST ignores NULLs. The caller commits, so the watermark lands in the
+    same transaction as the final page of ingested rows.
+    """
+    table = sync_state_model.SyncState.__table__
+    stmt = insert(table).values(
+        tenant_id=tenant_id,
+        resource=resource,
+        last_updated_at=last_updated_at,
+        last_synced_at=datetime.now(timezone.utc),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["tenant_id", "resource"],
+        set_={
+            "last_updated_at": func.greatest(table.c.last_updated_at, stmt.excluded.last_updated_at),
+            "last_synced_at": stmt.excluded.last_synced_at,
+        },
+    )
+    db.execute(stmt)
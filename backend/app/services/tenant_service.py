@@ -12,7 +12,8 @@ def create_tenant(db: Session, tenant: tenant_schema.TenantCreate):
     db_tenant = tenant_model.Tenant(
         name=tenant.name,
         shopify_store_url=tenant.shopify_store_url,
-        shopify_access_token=tenant.shopify_access_token
+        shopify_access_token=tenant.shopify_access_token,
+        timezone=tenant.timezone or "UTC"
     )
     db.add(db_tenant)
     db.commit()
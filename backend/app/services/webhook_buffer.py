@@ -0,0 +1,189 @@
+"""
+In-memory webhook buffer
+Verified Shopify webhook events are collected here and written to the database
+in micro-batches, flushed when WEBHOOK_FLUSH_MAX_EVENTS events are waiting or
+every WEBHOOK_FLUSH_INTERVAL_SECONDS, whichever comes first. Events for the same
+record are coalesced so a burst of updates becomes a single upsert; the event
+with the newest updated_at wins, since Shopify does not deliver in order, and
+a delete wins over any upsert.
+
+Each (tenant, resource) group is written and committed on its own, in a fixed
+order, so a flush holds at most one tenant's rollup lock at a time. A group
+whose write fails goes back into the buffer for the next flush: Shopify has
+already been answered 200 and will not deliver those events again.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models import tenant as tenant_model
+from app.services.ingestion_service import IngestionService
+
+logger = logging.getLogger(__name__)
+
+ACTION_UPSERT = "upsert"
+ACTION_DELETE = "delete"
+
+# Webhook topic -> (resource, action)
+WEBHOOK_TOPICS = {
+    "orders/create": ("orders", ACTION_UPSERT),
+    "orders/updated": ("orders", ACTION_UPSERT),
+    "customers/create": ("customers", ACTION_UPSERT),
+    "customers/update": ("customers", ACTION_UPSERT),
+    "products/create": ("products", ACTION_UPSERT),
+    "products/update": ("products", ACTION_UPSERT),
+    "products/delete": ("products", ACTION_DELETE),
+}
+
+
+def _updated_at(payload: dict) -> Optional[datetime]:
+    value = payload.get("updated_at")
+    if not value:
+        return None
+    try:
+        moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def _supersedes(new: tuple, current: tuple) -> bool:
+    """Whether the (action, payload) event new should replace the buffered event current"""
+    new_action, new_payload = new
+    current_action, current_payload = current
+    if current_action == ACTION_DELETE:
+        return False
+    if new_action == ACTION_DELETE:
+        return True
+    new_updated_at, current_updated_at = _updated_at(new_payload), _updated_at(current_payload)
+    if new_updated_at is None or current_updated_at is None:
+        return True
+    return new_updated_at >= current_updated_at
+
+
+class WebhookBufferFull(Exception):
+    """Raised when the buffer is at capacity; the webhook should be retried later"""
+
+
+class WebhookBuffer:
+    def __init__(self, flush_max_events: int, flush_interval_seconds: float, max_events: int):
+        self.flush_max_events = flush_max_events
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_events = max_events
+        self._lock = threading.Lock()
+        # (tenant_id, resource) -> {shopify id: (action, payload)}, newest state of each record
+        self._events: Dict[Tuple[int, str], OrderedDict] = {}
+        self._size = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add(self, tenant_id: int, topic: str, payload: dict):
+        resource, action = WEBHOOK_TOPICS[topic]
+        shopify_id = str(payload["id"])
+        with self._lock:
+            if self._size >= self.max_events:
+                raise WebhookBufferFull()
+            self._put((tenant_id, resource), shopify_id, (action, payload))
+            if self._size >= self.flush_max_events:
+                self._wake.set()
+
+    def _put(self, group: Tuple[int, str], shopify_id: str, event: tuple):
+        """Buffer an event unless a newer one for the record is already waiting; caller holds the lock"""
+        events = self._events.setdefault(group, OrderedDict())
+        current = events.get(shopify_id)
+        if current is None:
+            self._size += 1
+        elif not _supersedes(event, current):
+            return
+        events[shopify_id] = event
+
+    def _requeue(self, group: Tuple[int, str], group_events: OrderedDict):
+        """Put a group whose write failed back for the next flush; events that arrived since win if newer"""
+        with self._lock:
+            for shopify_id, event in group_events.items():
+                self._put(group, shopify_id, event)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="webhook-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the flusher and write whatever is still buffered"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+        self.flush()
+        if self._size:
+            logger.error("Shutting down with %d webhook events that could not be written", self._size)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Webhook flush failed")
+
+    def flush(self) -> int:
+        """
+        Write all buffered events, one transaction per (tenant, resource) group
+        in (tenant, resource) order; returns the number of events written
+        """
+        with self._lock:
+            events, self._events = self._events, {}
+            self._size = 0
+        if not events:
+            return 0
+
+        written = 0
+        db = SessionLocal()
+        try:
+            tenant_ids = {tenant_id for tenant_id, _ in events}
+            tenants = {
+                tenant.id: tenant
+                for tenant in db.query(tenant_model.Tenant).filter(tenant_model.Tenant.id.in_(tenant_ids))
+            }
+            for group in sorted(events):
+                group_events = events[group]
+                try:
+                    self._write_group(db, tenants, group, group_events)
+                    db.commit()
+                    written += len(group_events)
+                except Exception as e:
+                    db.rollback()
+                    self._requeue(group, group_events)
+                    logger.warning("Webhook write of %d %s events for tenant %s failed, retrying next flush: %s",
+                                   len(group_events), group[1], group[0], e)
+        finally:
+            db.close()
+        return written
+
+    def _write_group(self, db, tenants: dict, group: Tuple[int, str], group_events: OrderedDict):
+        tenant_id, resource = group
+        tenant = tenants.get(tenant_id)
+        if tenant is None:
+            return
+        ingestion_service = IngestionService(db, tenant)
+        upserts = [payload for action, payload in group_events.values() if action == ACTION_UPSERT]
+        deletes = [shopify_id for shopify_id, (action, _) in group_events.items() if action == ACTION_DELETE]
+        if upserts:
+            ingestion_service.write_records(resource, upserts)
+        if deletes:
+            ingestion_service.delete_records(resource, deletes)
+
+
+webhook_buffer = WebhookBuffer(
+    flush_max_events=settings.WEBHOOK_FLUSH_MAX_EVENTS,
+    flush_interval_seconds=settings.WEBHOOK_FLUSH_INTERVAL_SECONDS,
+    max_events=settings.WEBHOOK_BUFFER_MAX_EVENTS,
+)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Initial backfill for a new tenant using PostgreSQL COPY.
+Loads every record from Shopify (or a Bulk Operation JSONL export) through an
+unlogged staging table; rows that already exist are skipped, not updated.
+
+Usage: python backfill.py <tenant_id> <products|orders|customers|all> [bulk-export-url-or-path]
+"""
+import sys
+import os
+import json
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from app.db.session import SessionLocal
+from app.services import tenant_service
+from app.services.bulk_import_service import iter_bulk_pages
+from app.services.ingestion_service import IngestionService
+
+# Customers first so orders can be linked to them while they are merged
+ALL_RESOURCES = ("customers", "products", "orders")
+
+def backfill(tenant_id: int, resource: str, source: str = None):
+    if resource == "all" and source:
+        print("A bulk export holds a single resource; name it instead of 'all'")
+        return False
+    db = SessionLocal()
+    try:
+        tenant = tenant_service.get_tenant(db, tenant_id)
+        if tenant is None:
+            print(f"Tenant {tenant_id} not found")
+            return False
+        ingestion_service = IngestionService(db, tenant)
+        ok = True
+        for name in (ALL_RESOURCES if resource == "all" else (resource,)):
+            pages = iter_bulk_pages(source, name) if source else None
+            result = ingestion_service.backfill(name, pages)
+            print(f"{name}: {json.dumps(result, indent=2, default=str)}")
+            ok = ok and result["status"] == "success"
+        return ok
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (3, 4):
+        print(__doc__)
+        sys.exit(2)
+    sys.exit(0 if backfill(int(sys.argv[1]), sys.argv[2], sys.argv[3] if len(sys.argv) == 4 else None) else 1)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark Shopify order page decoding.
+
+Scales the mock order fixtures up to full API pages and compares:
+  json      - response.json() on the full payload, then reading the stored fields
+  msgspec   - projected struct decode of the full payload
+  projected - projected struct decode of a fields= payload (what Shopify returns
+              when IngestionService requests only the stored fields)
+
+Usage: python benchmarks/bench_decode.py [--pages N] [--page-size N] [--repeat N]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.shopify_client import MAX_PAGE_SIZE
+from app.services.shopify_decode import RESOURCE_FIELDS, decode_page
+from app.services.shopify_mock_fixtures import ShopifyMockFixtures
+
+
+def build_page(fixtures, page_size: int, page_number: int, fields=None) -> bytes:
+    """One orders page of page_size records cycled from the fixtures, with unique ids"""
+    orders = []
+    for i in range(page_size):
+        order = dict(fixtures[i % len(fixtures)])
+        order["id"] = 6000000000000 + page_number * page_size + i
+        if fields:
+            order = {key: order[key] for key in fields if key in order}
+        orders.append(order)
+    return json.dumps({"orders": orders}).encode("utf-8")
+
+
+def decode_json(body: bytes):
+    """The previous path: decode everything, then read the stored fields"""
+    return [
+        (order["id"], order.get("total_price"), order.get("currency"), order["created_at"], order.get("updated_at"))
+        for order in json.loads(body).get("orders", [])
+    ]
+
+
+def decode_structs(body: bytes):
+    return [
+        (order.id, order.total_price, order.currency, order.created_at, order.updated_at)
+        for order in decode_page("orders", body)
+    ]
+
+
+def measure(decode, pages, repeat: int):
+    """Best wall time over repeat runs and peak traced memory of decoding a single page"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for body in pages:
+            decode(body)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    decode(pages[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Shopify order page decoding")
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--page-size", type=int, default=MAX_PAGE_SIZE)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # The fixtures are randomised per call, so both payload shapes share one draw
+    fixtures = ShopifyMockFixtures.get_orders_response()["orders"]
+    fields = RESOURCE_FIELDS["orders"].split(",")
+    full_pages = [build_page(fixtures, args.page_size, n) for n in range(args.pages)]
+    projected_pages = [build_page(fixtures, args.page_size, n, fields) for n in range(args.pages)]
+    records = args.pages * args.page_size
+
+    # Both decoders must agree before their speed is worth comparing
+    assert decode_json(full_pages[0]) == decode_structs(full_pages[0]) == decode_structs(projected_pages[0])
+
+    cases = [
+        ("json", decode_json, full_pages),
+        ("msgspec", decode_structs, full_pages),
+        ("projected", decode_structs, projected_pages),
+    ]
+    print(f"{records} orders in {args.pages} pages of {args.page_size}, best of {args.repeat}")
+    print(f"{'decoder':<10} {'KB/page':>9} {'seconds':>9} {'orders/s':>11} {'peak KB/page':>13} {'speedup':>8}")
+    baseline = None
+    for name, decode, pages in cases:
+        seconds, peak = measure(decode, pages, args.repeat)
+        baseline = baseline or seconds
+        print(
+            f"{name:<10} {len(pages[0]) / 1024:>9.1f} {seconds:>9.3f} {records / seconds:>11,.0f} "
+            f"{peak / 1024:>13.1f} {baseline / seconds:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
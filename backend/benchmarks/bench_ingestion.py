@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Benchmark IngestionService end to end against synthetic stores.
+
+For each dataset size (number of orders; the store also gets size/10
+customers and size/100 products) a fresh tenant is ingested twice, each time
+in its own process so peak RSS belongs to that run alone:
+  first_load - every row is new
+  resync     - a full resync of the same data, where every row is unchanged
+Each case records rows/sec, peak RSS and the number of SQL statements sent.
+
+Results can be saved as a JSON baseline and later runs compared against it;
+a case that is slower, bigger or chattier than the baseline by more than
+--threshold is reported as a regression and the script exits with status 1.
+Baselines are machine specific, so record one on the machine that compares.
+
+Runs in mock mode against the database in DATABASE_URL, whose tables must
+exist (alembic upgrade head). The benchmark tenants are deleted afterwards.
+
+Usage: python benchmarks/bench_ingestion.py [--sizes 10000,100000,1000000] [--baseline PATH]
+                                            [--save-baseline] [--threshold 0.2]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BACKEND_DIR)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+MODES = ("first_load", "resync")
+# Ingest order: customers first so orders link to them as they are written
+RESOURCES = ("customers", "products", "orders")
+# Metric -> whether a higher value is better
+METRICS = {"rows_per_sec": True, "peak_rss_mb": False, "queries": False}
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(size: int, mode: str, tenant_id: int, seed: int) -> dict:
+    """Ingest one dataset in one mode inside the current process and return its measurements"""
+    from sqlalchemy import event
+    from app.core.config import settings
+    from app.db.session import SessionLocal, engine
+    from app.models import Tenant
+    from app.services.ingestion_service import IngestionService
+
+    settings.USE_SHOPIFY_API = False
+    settings.MOCK_DATA_SOURCE = "synthetic"
+    settings.SYNTHETIC_ORDERS = size
+    settings.SYNTHETIC_CUSTOMERS = max(size // 10, 1)
+    settings.SYNTHETIC_PRODUCTS = max(size // 100, 1)
+
+    db = SessionLocal()
+    try:
+        if tenant_id is None:
+            tenant = Tenant(
+                name=f"bench-{size}-{int(time.time())}",
+                shopify_store_url=f"bench-{size}-{time.time_ns()}.myshopify.com",
+                shopify_access_token="bench",
+            )
+            db.add(tenant)
+            db.commit()
+        else:
+            tenant = db.get(Tenant, tenant_id)
+        # store_for_tenant offsets the seed by tenant id; cancel that so every run sees the same store
+        settings.SYNTHETIC_SEED = seed - tenant.id
+
+        queries = 0
+
+        def count_query(*_):
+            nonlocal queries
+            queries += 1
+
+        event.listen(engine, "before_cursor_execute", count_query)
+        service = IngestionService(db, tenant)
+        results = {}
+        started = time.perf_counter()
+        for name in RESOURCES:
+            results[name] = getattr(service, f"ingest_{name}")(full_resync=mode == "resync")
+        elapsed = time.perf_counter() - started
+        event.remove(engine, "before_cursor_execute", count_query)
+
+        failed = {name: result.get("message") for name, result in results.items() if result["status"] != "success"}
+        rows = sum(result.get("total_processed", 0) for result in results.values())
+        return {
+            "tenant_id": tenant.id,
+            "status": "error" if failed else "success",
+            "errors": failed,
+            "rows": rows,
+            "seconds": round(elapsed, 3),
+            "rows_per_sec": round(rows / elapsed, 1) if elapsed else 0.0,
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+            "queries": queries,
+            "resources": {
+                name: {key: result.get(key) for key in ("total_processed", "created", "updated", "unchanged", "rows_per_sec")}
+                for name, result in results.items()
+            },
+        }
+    finally:
+        db.close()
+
+
+def spawn_case(size: int, mode: str, tenant_id: int, seed: int) -> dict:
+    """Run one case in a child process and return its JSON result"""
+    command = [sys.executable, os.path.abspath(__file__), "--case", str(size), mode, "--seed", str(seed)]
+    if tenant_id is not None:
+        command += ["--tenant-id", str(tenant_id)]
+    completed = subprocess.run(command, cwd=BACKEND_DIR, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{mode} of {size} failed:\n{completed.stderr}")
+    # The result is the last line; ingestion may log above it
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def delete_tenant(tenant_id: int):
+    from sqlalchemy import text
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        for table in ("order_line_item", "order", "customer", "product", "sync_run", "sync_state", "tenant_daily_stats", "tenant"):
+            column = "id" if table == "tenant" else "tenant_id"
+            db.execute(text(f'DELETE FROM "{table}" WHERE {column} = :tenant_id'), {"tenant_id": tenant_id})
+        db.commit()
+    finally:
+        db.close()
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Human-readable regressions of results against baseline beyond threshold"""
+    regressions = []
+    for case, measured in results.items():
+        expected = baseline.get(case)
+        if not expected:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            before, after = expected.get(metric), measured.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append(f"{case} {metric}: {before} -> {after} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark IngestionService against synthetic stores")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated order counts")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run's results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative change that counts as a regression")
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark tenants and their data")
+    parser.add_argument("--case", nargs=2, metavar=("SIZE", "MODE"), help=argparse.SUPPRESS)
+    parser.add_argument("--tenant-id", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(int(args.case[0]), args.case[1], args.tenant_id, args.seed)))
+        return
+
+    results = {}
+    print(f"{'case':<20} {'rows':>9} {'seconds':>9} {'rows/s':>10} {'peak RSS MB':>12} {'queries':>9}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        tenant_id = None
+        try:
+            for mode in MODES:
+                result = spawn_case(size, mode, tenant_id, args.seed)
+                tenant_id = result.pop("tenant_id")
+                case = f"{size}/{mode}"
+                results[case] = result
+                print(f"{case:<20} {result['rows']:>9} {result['seconds']:>9.2f} {result['rows_per_sec']:>10,.0f} "
+                      f"{result['peak_rss_mb']:>12.1f} {result['queries']:>9}")
+                if result["status"] != "success":
+                    print(f"  errors: {result['errors']}")
+        finally:
+            if tenant_id is not None and not args.keep:
+                delete_tenant(tenant_id)
+
+    failed = [case for case, result in results.items() if result["status"] != "success"]
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"Regressions beyond {args.threshold:.0%} of {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} of {args.baseline}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Shopify Admin REST API.
+
+Serves /admin/api/{version}/shop.json, products.json, orders.json and
+customers.json from a seeded SyntheticStore, with the behaviour the live
+transport has to cope with:
+  - cursor pagination (Link rel="next" with page_info), fields= and updated_at_min
+  - X-Shopify-Shop-Api-Call-Limit headers from a per-token leaky bucket, and
+    429 + Retry-After once a client overruns it
+  - 401 for a wrong access token (with --token)
+  - injected faults: per-request latency, 429 bursts, slow pages, connections
+    dropped before a response and responses cut off mid-body
+
+Point a tenant at it with SHOPIFY_API_SCHEME=http USE_SHOPIFY_API=true and the
+tenant's shopify_store_url set to host:port (e.g. localhost:8787).
+GET /_standin/stats returns request and fault counters.
+
+Usage: python benchmarks/shopify_standin.py [--port N] [--orders N] [--latency-ms N] [--drop-rate P] ...
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.shopify_client import MAX_PAGE_SIZE
+from app.services.shopify_mock_fixtures import ShopifyMockFixtures
+from app.services.shopify_rate_limiter import DEFAULT_BUCKET_SIZE, DEFAULT_LEAK_RATE
+from app.services.shopify_synthetic import SyntheticStore
+
+RESOURCES = ("products", "orders", "customers")
+
+
+class StandinBucket:
+    """Server side of Shopify's leaky bucket: one unit per call, draining at leak_rate per second"""
+
+    def __init__(self, capacity: int, leak_rate: float):
+        self.capacity = capacity
+        self.leak_rate = leak_rate
+        self.level = 0.0
+        self.updated = time.monotonic()
+
+    def take(self):
+        """(allowed, used) for one call; a refused call does not fill the bucket"""
+        now = time.monotonic()
+        self.level = max(0.0, self.level - (now - self.updated) * self.leak_rate)
+        self.updated = now
+        if self.level + 1 > self.capacity:
+            return False, self.capacity
+        self.level += 1
+        return True, int(self.level + 0.999)
+
+
+class Standin:
+    """Data, fault configuration and counters shared by every request handler"""
+
+    def __init__(self, args):
+        self.args = args
+        self.store = SyntheticStore(
+            seed=args.seed, products=args.products, customers=args.customers, orders=args.orders, days=args.days,
+        )
+        self.random = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.buckets = {}
+        self.burst_remaining = 0
+        self.stats = {key: 0 for key in ("requests", "pages", "records", "throttled", "bursts", "slow", "dropped", "truncated", "unauthorized")}
+
+    def count(self, key: str, amount: int = 1):
+        with self.lock:
+            self.stats[key] += amount
+
+    def chance(self, probability: float) -> bool:
+        with self.lock:
+            return probability > 0 and self.random.random() < probability
+
+    def throttle(self, token: str):
+        """(allowed, used) after leaky-bucket accounting and any injected 429 burst"""
+        with self.lock:
+            if self.burst_remaining > 0:
+                self.burst_remaining -= 1
+                return False, self.args.bucket_size
+            if self.args.burst_rate > 0 and self.random.random() < self.args.burst_rate:
+                self.stats["bursts"] += 1
+                self.burst_remaining = self.args.burst_length - 1
+                return False, self.args.bucket_size
+            bucket = self.buckets.get(token)
+            if bucket is None:
+                bucket = self.buckets[token] = StandinBucket(self.args.bucket_size, self.args.leak_rate)
+            return bucket.take()
+
+    def latency(self) -> float:
+        with self.lock:
+            jitter = self.random.uniform(-self.args.jitter_ms, self.args.jitter_ms) if self.args.jitter_ms else 0.0
+        return max(0.0, self.args.latency_ms + jitter) / 1000
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like Shopify
+    standin: Standin = None
+
+    def log_message(self, format, *args):
+        if self.standin.args.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, status: int, payload, headers: dict = None, truncate: bool = False):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if truncate:
+            # Promise the full body, send half of it and hang up
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.drop()
+            return
+        self.wfile.write(body)
+
+    def drop(self):
+        self.close_connection = True
+        try:
+            self.connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def do_GET(self):
+        standin = self.standin
+        args = standin.args
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if url.path == "/_standin/stats":
+            with standin.lock:
+                self.send_json(200, dict(standin.stats))
+            return
+
+        standin.count("requests")
+        time.sleep(standin.latency())
+        if standin.chance(args.drop_rate):
+            standin.count("dropped")
+            self.drop()
+            return
+
+        token = self.headers.get("X-Shopify-Access-Token", "")
+        if args.token and token != args.token:
+            standin.count("unauthorized")
+            self.send_json(401, {"errors": "[API] Invalid API key or access token (unrecognized login or wrong password)"})
+            return
+
+        allowed, used = standin.throttle(token)
+        call_limit = {"X-Shopify-Shop-Api-Call-Limit": f"{used}/{args.bucket_size}"}
+        if not allowed:
+            standin.count("throttled")
+            self.send_json(429, {"errors": "Exceeded 2 calls per second for api client. Reduce request rates to resume uninterrupted service."},
+                           {**call_limit, "Retry-After": f"{args.retry_after:.1f}"})
+            return
+
+        prefix = f"/admin/api/{args.api_version}/"
+        name = url.path[len(prefix):] if url.path.startswith(prefix) else ""
+        if name == "shop.json":
+            self.send_json(200, ShopifyMockFixtures.get_shop_response(), call_limit)
+            return
+        resource = name[:-len(".json")] if name.endswith(".json") else ""
+        if resource not in RESOURCES:
+            self.send_json(404, {"errors": "Not Found"}, call_limit)
+            return
+
+        if query.get("page_info") and set(query) - {"page_info", "limit", "fields"}:
+            # Shopify rejects filters alongside page_info; clients must follow the link as given
+            self.send_json(400, {"errors": {"page_info": ["Invalid value."]}}, call_limit)
+            return
+        try:
+            limit = min(int(query.get("limit", 50)), MAX_PAGE_SIZE)
+            records, next_page_info = standin.store.page(
+                resource, limit=limit, page_info=query.get("page_info"), updated_at_min=query.get("updated_at_min"),
+            )
+        except ValueError:
+            self.send_json(400, {"errors": {"page_info": ["Invalid value."]}}, call_limit)
+            return
+        if query.get("fields"):
+            fields = query["fields"].split(",")
+            records = [{key: record[key] for key in fields if key in record} for record in records]
+
+        headers = dict(call_limit)
+        if next_page_info:
+            next_query = {"limit": limit, "page_info": next_page_info}
+            if query.get("fields"):
+                next_query["fields"] = query["fields"]
+            headers["Link"] = f'<http://{self.headers.get("Host")}{prefix}{resource}.json?{urlencode(next_query)}>; rel="next"'
+
+        if standin.chance(args.slow_page_rate):
+            standin.count("slow")
+            time.sleep(args.slow_page_ms / 1000)
+        truncate = standin.chance(args.truncate_rate)
+        standin.count("truncated" if truncate else "pages")
+        if not truncate:
+            standin.count("records", len(records))
+        self.send_json(200, {resource: records}, headers, truncate=truncate)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Local Shopify Admin REST API stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--api-version", default="2023-10")
+    parser.add_argument("--token", default="", help="Required X-Shopify-Access-Token (any token if empty)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--customers", type=int, default=5000)
+    parser.add_argument("--orders", type=int, default=50000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added to every request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter on the latency")
+    parser.add_argument("--bucket-size", type=int, default=DEFAULT_BUCKET_SIZE)
+    parser.add_argument("--leak-rate", type=float, default=DEFAULT_LEAK_RATE, help="Calls per second the bucket drains")
+    parser.add_argument("--retry-after", type=float, default=2.0, help="Retry-After seconds on 429s")
+    parser.add_argument("--burst-rate", type=float, default=0.0, help="Chance a request starts a burst of 429s")
+    parser.add_argument("--burst-length", type=int, default=3, help="Consecutive 429s per burst")
+    parser.add_argument("--slow-page-rate", type=float, default=0.0, help="Chance a page is delayed by --slow-page-ms")
+    parser.add_argument("--slow-page-ms", type=float, default=5000.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Chance a connection is closed without a response")
+    parser.add_argument("--truncate-rate", type=float, default=0.0, help="Chance a page is cut off mid-body")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    return parser
+
+
+def make_server(args) -> ThreadingHTTPServer:
+    """Build (without starting) a stand-in server for parsed arguments; port 0 picks a free port"""
+    handler = type("Handler", (StandinHandler,), {"standin": Standin(args)})
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    args = build_parser().parse_args()
+    server = make_server(args)
+    host, port = server.server_address[:2]
+    print(f"Shopify stand-in on http://{host}:{port}/admin/api/{args.api_version}/ "
+          f"({args.products} products, {args.customers} customers, {args.orders} orders, seed {args.seed})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Check that the dashboard and ingest queries use the tenant-scoped indexes.
+The real dashboard and ingestion code runs for one tenant inside a
+transaction that is rolled back; every statement it sends is captured and
+EXPLAINed (plans only, nothing is executed twice). Each index a workload
+depends on must appear in the plan of at least one of its statements,
+otherwise the script exits with status 1.
+
+The planner rightly prefers sequential scans on small tables, so run this
+against a tenant with a realistic amount of data (e.g. one ingested from the
+synthetic store, MOCK_DATA_SOURCE=synthetic).
+
+Usage: python check_query_plans.py <tenant_id> [--verbose]
+"""
+import sys
+import os
+import re
+from datetime import timedelta
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from sqlalchemy import event, func
+from app.db.session import SessionLocal, engine
+from app.models import Order
+from app.services import dashboard_service, tenant_service
+from app.services.ingestion_service import IngestionService
+from app.services.shopify_mock_fixtures import ShopifyMockFixtures
+
+# Workload -> indexes its plans must use
+EXPECTED_INDEXES = {
+    "dashboard": ("ix_order_tenant_id_created_at", "ix_customer_tenant_id_total_spent"),
+    "ingest orders": ("ix_order_tenant_id_shopify_order_id", "ix_order_line_item_tenant_id_shopify_line_item_id",
+                      "ix_order_tenant_id_created_at"),
+    "ingest customers": ("ix_customer_tenant_id_shopify_customer_id", "ix_order_tenant_id_shopify_customer_id",
+                         "ix_customer_tenant_id_created_at"),
+    "delete orders": ("ix_order_tenant_id_shopify_order_id",),
+}
+
+INDEX_SCAN = re.compile(r"(?:Index (?:Only )?Scan(?: Backward)? using|Bitmap Index Scan on) (\w+)")
+ARBITER = re.compile(r"Conflict Arbiter Indexes: (.+)")
+PLANNED = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+
+def plan_indexes(plan: str) -> set:
+    indexes = set(INDEX_SCAN.findall(plan))
+    for names in ARBITER.findall(plan):
+        indexes.update(name.strip() for name in names.split(","))
+    return indexes
+
+
+def capture(db, run) -> list:
+    """(statement, parameters) of every plannable statement run() sends"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(PLANNED):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return statements
+
+
+def check(tenant_id: int, verbose: bool = False):
+    db = SessionLocal()
+    try:
+        tenant = tenant_service.get_tenant(db, tenant_id)
+        if tenant is None:
+            print(f"Tenant {tenant_id} not found")
+            return False
+        latest = db.query(func.max(Order.created_at)).filter(Order.tenant_id == tenant.id).scalar()
+        if latest is None:
+            print(f"Tenant {tenant_id} has no orders; plans would not be representative")
+            return False
+        service = IngestionService(db, tenant)
+        orders = ShopifyMockFixtures.get_orders_response()["orders"]
+        customers = ShopifyMockFixtures.get_customers_response()["customers"]
+        existing = [shopify_id for shopify_id, in db.query(Order.shopify_order_id).filter(Order.tenant_id == tenant.id).limit(10)]
+
+        workloads = {
+            "dashboard": lambda: (
+                # Hourly series scan raw orders in range; top customers come with every payload
+                dashboard_service.get_dashboard_data(
+                    db, tenant.id, date_from=latest - timedelta(days=7), date_to=latest,
+                    granularity="hour", tz_name="UTC",
+                ),
+                dashboard_service.get_dashboard_data(db, tenant.id, tz_name=tenant.timezone),
+            ),
+            "ingest orders": lambda: service.write_records("orders", orders),
+            "ingest customers": lambda: service.write_records("customers", customers),
+            "delete orders": lambda: service.delete_records("orders", existing),
+        }
+
+        ok = True
+        for name, run in workloads.items():
+            statements = capture(db, run)
+            used = set()
+            print(f"{name}: {len(statements)} statements")
+            for statement, parameters in statements:
+                plan = "\n".join(row[0] for row in db.connection().exec_driver_sql(f"EXPLAIN {statement}", parameters))
+                indexes = plan_indexes(plan)
+                used |= indexes
+                if verbose:
+                    print(f"  {' '.join(statement.split())[:100]}")
+                    print(f"    indexes: {', '.join(sorted(indexes)) or 'none'}")
+            for index in EXPECTED_INDEXES[name]:
+                found = index in used
+                ok = ok and found
+                print(f"  {'ok' if found else 'NOT USED'}  {index}")
+        return ok
+    finally:
+        # Nothing the workloads wrote is kept
+        db.rollback()
+        db.close()
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--verbose"]
+    if len(args) != 1:
+        print(__doc__)
+        sys.exit(2)
+    sys.exit(0 if check(int(args[0]), verbose="--verbose" in sys.argv) else 1)
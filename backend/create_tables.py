@@ -15,13 +15,15 @@ from app.db.base import Base
 
 def create_tables():
     """Create all database tables."""
-    from app.db.session import engine, ensure_schema_exists
+    from app.db.session import engine, ensure_conflict_indexes, ensure_schema_exists
     
     # Ensure schema exists first
     ensure_schema_exists()
     
     # Create all tables
     Base.metadata.create_all(bind=engine)
+    # Tables that already existed do not get new indexes from create_all
+    ensure_conflict_indexes()
     print("All database tables created successfully!")
     print(f"Schema: {settings.DATABASE_SCHEMA}")
 
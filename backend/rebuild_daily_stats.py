@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Rebuild the tenant_daily_stats rollup from the raw order and customer rows.
+Ingestion keeps the rollup current on its own; run this after loading data
+some other way (SQL imports, restores) or to populate the table for tenants
+ingested before it existed. Each tenant is rebuilt in its own transaction.
+
+Usage: python rebuild_daily_stats.py <tenant_id|all>
+"""
+import sys
+import os
+import time
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from app.db.session import SessionLocal
+from app.models import Tenant
+from app.services import daily_stats_service
+from app.services.dashboard_cache import mark_changed
+
+def rebuild(target: str):
+    db = SessionLocal()
+    try:
+        query = db.query(Tenant).order_by(Tenant.id)
+        tenants = query.all() if target == "all" else query.filter(Tenant.id == int(target)).all()
+        if not tenants:
+            print(f"Tenant {target} not found")
+            return False
+        for tenant in tenants:
+            started = time.perf_counter()
+            daily_stats_service.rebuild(db, tenant)
+            mark_changed(db, tenant.id)
+            db.commit()
+            print(f"Tenant {tenant.id} ({tenant.timezone}): rebuilt in {time.perf_counter() - started:.2f}s")
+        return True
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print(__doc__)
+        sys.exit(2)
+    sys.exit(0 if rebuild(sys.argv[1]) else 1)
@@ -0,0 +1,60 @@
+"""
+Unit tests for the pure parts of bulk upserts (no database needed)
+"""
+import os
+import subprocess
+import sys
+from app.services.bulk_upsert import chunked, content_hash, dedupe_rows
+
+KEY = ("tenant_id", "shopify_order_id")
+
+
+def test_dedupe_keeps_last_row_per_conflict_key():
+    rows = [
+        {"tenant_id": 1, "shopify_order_id": "10", "total_price": 1.0},
+        {"tenant_id": 1, "shopify_order_id": "11", "total_price": 2.0},
+        {"tenant_id": 1, "shopify_order_id": "10", "total_price": 3.0},
+    ]
+    deduped = dedupe_rows(rows, KEY)
+    assert [(row["shopify_order_id"], row["total_price"]) for row in deduped] == [("10", 3.0), ("11", 2.0)]
+
+
+def test_dedupe_keys_include_tenant():
+    rows = [
+        {"tenant_id": 1, "shopify_order_id": "10", "total_price": 1.0},
+        {"tenant_id": 2, "shopify_order_id": "10", "total_price": 2.0},
+    ]
+    assert len(dedupe_rows(rows, KEY)) == 2
+
+
+def test_dedupe_accepts_a_generator():
+    rows = ({"tenant_id": 1, "shopify_order_id": str(i % 3)} for i in range(10))
+    assert sorted(row["shopify_order_id"] for row in dedupe_rows(rows, KEY)) == ["0", "1", "2"]
+
+
+def test_chunked():
+    assert list(chunked(list(range(7)), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(chunked([], 3)) == []
+
+
+def test_content_hash_covers_only_update_columns():
+    row = {"shopify_order_id": "10", "total_price": 5.0, "currency": "USD", "created_at": "x"}
+    columns = ("total_price", "currency")
+    assert content_hash(row, columns) == content_hash(dict(row, created_at="y"), columns)
+    assert content_hash(row, columns) != content_hash(dict(row, total_price=5.5), columns)
+    assert -2 ** 63 <= content_hash(row, columns) < 2 ** 63
+
+
+def test_content_hash_is_stable_across_processes():
+    # Stored hashes are compared by later syncs in other processes, so str hash randomisation must not leak in
+    code = (
+        "from app.services.bulk_upsert import content_hash; "
+        "print(content_hash({'title': 'Mug', 'vendor': 'Home', 'price': 1.5}, ('title', 'vendor', 'price')))"
+    )
+    backend = os.path.dirname(os.path.abspath(__file__))
+    hashes = set()
+    for seed in ("1", "2"):
+        env = dict(os.environ, PYTHONHASHSEED=seed, PYTHONPATH=backend)
+        hashes.add(subprocess.run([sys.executable, "-c", code], env=env, cwd=backend, capture_output=True,
+                                  text=True, check=True).stdout.strip())
+    assert hashes == {str(content_hash({"title": "Mug", "vendor": "Home", "price": 1.5}, ("title", "vendor", "price")))}
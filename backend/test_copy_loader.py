@@ -0,0 +1,57 @@
+"""
+Unit tests for COPY text rendering (no database needed)
+"""
+from datetime import datetime, timedelta, timezone
+from app.services.copy_loader import CopyRowStream, CopySpool, format_copy_row
+
+COLUMNS = ("shopify_product_id", "title", "created_at")
+
+
+def test_escapes_and_nulls():
+    row = {"shopify_product_id": "1", "title": "tab\there\nnew\\line\rcr", "created_at": None}
+    assert format_copy_row(row, COLUMNS) == "1\ttab\\there\\nnew\\\\line\\rcr\t\\N\n"
+
+
+def test_naive_datetimes_are_written_as_is():
+    row = {"shopify_product_id": "1", "title": "a", "created_at": datetime(2024, 3, 1, 15, 0)}
+    assert format_copy_row(row, COLUMNS) == "1\ta\t2024-03-01T15:00:00\n"
+
+
+def test_aware_datetimes_are_written_as_naive_utc():
+    # Staging columns are timestamp without time zone, which would drop the offset
+    created_at = datetime(2024, 3, 1, 10, 0, tzinfo=timezone(timedelta(hours=-5)))
+    row = {"shopify_product_id": "1", "title": "a", "created_at": created_at}
+    assert format_copy_row(row, COLUMNS) == "1\ta\t2024-03-01T15:00:00\n"
+
+
+def test_stream_reads_in_any_size_and_counts_rows():
+    rows = [{"shopify_product_id": str(i), "title": f"product {i}", "created_at": None} for i in range(50)]
+    expected = "".join(format_copy_row(row, COLUMNS) for row in rows)
+    stream = CopyRowStream(iter(rows), COLUMNS)
+    chunks = []
+    while True:
+        chunk = stream.read(7)
+        if not chunk:
+            break
+        assert len(chunk) <= 7
+        chunks.append(chunk)
+    assert "".join(chunks) == expected
+    assert stream.rows == 50
+
+
+def test_stream_read_all():
+    rows = [{"shopify_product_id": "1", "title": "a", "created_at": None}]
+    stream = CopyRowStream(rows, COLUMNS)
+    assert stream.read() == "1\ta\t\\N\n"
+    assert stream.read() == ""
+
+
+def test_spool_takes_columns_from_first_row():
+    spool = CopySpool()
+    try:
+        spool.write({"id": 1, "sku": None})
+        spool.write({"sku": "X", "id": 2})
+        assert spool.rows == 2
+        assert spool.rewind().read() == "1\t\\N\n2\tX\n"
+    finally:
+        spool.close()
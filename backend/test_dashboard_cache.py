@@ -0,0 +1,38 @@
+"""
+Unit tests for the dashboard response cache (no database needed)
+"""
+from app.services.dashboard_cache import DashboardCache, matches
+
+
+def test_entries_are_served_only_at_their_version():
+    cache = DashboardCache(max_entries=10)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"total_orders": len(calls)}
+
+    assert cache.get(1, 5, "q", compute) == ('"1-5"', {"total_orders": 1}, False)
+    assert cache.get(1, 5, "q", compute) == ('"1-5"', {"total_orders": 1}, True)
+    # Another process committed a write: the database version moved on
+    assert cache.get(1, 6, "q", compute) == ('"1-6"', {"total_orders": 2}, False)
+    assert cache.get(2, 6, "q", compute)[2] is False
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = DashboardCache(max_entries=2)
+    for key in ("a", "b"):
+        cache.get(1, 1, key, dict)
+    cache.get(1, 1, "a", dict)
+    cache.get(1, 1, "c", dict)
+    assert cache.get(1, 1, "a", dict)[2] is True
+    assert cache.get(1, 1, "b", dict)[2] is False
+
+
+def test_matches():
+    etag = DashboardCache.etag(1, 5)
+    assert matches(etag, etag)
+    assert matches(f'"x", W/{etag}', etag)
+    assert matches("*", etag)
+    assert not matches('"1-4"', etag)
+    assert not matches(None, etag)
@@ -0,0 +1,61 @@
+"""
+The dashboard series size limit also applies when a date bound is missing:
+open ends reach the tenant's first or last day with orders.
+Needs the configured database with the schema migrated (alembic upgrade head).
+"""
+import uuid
+from datetime import date, datetime
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.db.session import SessionLocal
+from app.models.tenant import Tenant
+from app.models.tenant_daily_stats import TenantDailyStats
+from app.services.dashboard_service import get_dashboard_data
+
+
+@pytest.fixture
+def db():
+    db = SessionLocal()
+    try:
+        db.execute(text("SELECT 1"))
+    except OperationalError:
+        db.close()
+        pytest.skip("database not reachable")
+    yield db
+    db.rollback()
+    db.close()
+
+
+@pytest.fixture
+def tenant_id(db):
+    """A tenant with orders a year apart; nothing is committed"""
+    tenant = Tenant(name=f"dash-{uuid.uuid4().hex[:8]}", shopify_store_url=f"dash-{uuid.uuid4().hex[:8]}.myshopify.com",
+                    shopify_access_token="x", timezone="UTC")
+    db.add(tenant)
+    db.flush()
+    for day in (date(2024, 1, 1), date(2025, 1, 1)):
+        db.add(TenantDailyStats(tenant_id=tenant.id, day=day, currency="USD", order_count=1, revenue=10.0,
+                                distinct_buyers=1, new_customers=0))
+    db.flush()
+    return tenant.id
+
+
+@pytest.mark.parametrize("bounds", [
+    {},
+    {"date_from": datetime(2024, 1, 1)},
+    {"date_to": datetime(2025, 1, 1)},
+])
+def test_open_ended_hourly_range_over_the_limit_is_rejected(db, tenant_id, bounds):
+    with pytest.raises(ValueError, match="buckets"):
+        get_dashboard_data(db, tenant_id, granularity="hour", **bounds)
+
+
+def test_open_ended_daily_range_within_the_limit(db, tenant_id):
+    data = get_dashboard_data(db, tenant_id, granularity="day")
+    assert data["total_orders"] == 2
+
+
+def test_open_end_is_resolved_from_the_orders(db, tenant_id):
+    # 2024-12-01 to the last order day is well under the limit
+    get_dashboard_data(db, tenant_id, granularity="hour", date_from=datetime(2024, 12, 1))
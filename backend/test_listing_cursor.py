@@ -0,0 +1,40 @@
+"""
+Unit tests for keyset listing cursors (no database needed)
+"""
+import base64
+from datetime import datetime
+import pytest
+from app.models.customer import Customer
+from app.models.order import Order
+from app.services.listing_service import decode_cursor, encode_cursor
+
+
+def test_round_trip_datetime():
+    created_at = datetime(2024, 3, 1, 15, 0, 0, 123456)
+    cursor = encode_cursor("created_at", True, created_at, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "created_at", True, Order.created_at) == (created_at, 42)
+
+
+def test_round_trip_number():
+    cursor = encode_cursor("total_spent", False, 99.5, 7)
+    assert decode_cursor(cursor, "total_spent", False, Customer.total_spent) == (99.5, 7)
+
+
+@pytest.mark.parametrize("sort, descending", [("created_at", True), ("total_spent", False)])
+def test_rejects_cursor_from_another_sort(sort, descending):
+    cursor = encode_cursor("total_spent", True, 99.5, 7)
+    with pytest.raises(ValueError, match="different sort"):
+        decode_cursor(cursor, sort, descending, Customer.total_spent)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64 at all!",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    base64.urlsafe_b64encode(b'["created_at", "desc", "2024-03-01"]').decode(),
+    base64.urlsafe_b64encode(b'["created_at", "desc", "yesterday", 1]').decode(),
+    base64.urlsafe_b64encode(b'["created_at", "desc", "2024-03-01T00:00:00", "x"]').decode(),
+])
+def test_rejects_malformed_cursors(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor, "created_at", True, Order.created_at)
@@ -0,0 +1,94 @@
+"""
+Unit tests for Shopify request pacing and retry delays (no network needed)
+The bucket reads time.monotonic(), which the tests replace with a manual clock.
+"""
+import pytest
+from app.core.config import settings
+from app.services import shopify_rate_limiter
+from app.services.shopify_rate_limiter import LeakyBucket, backoff_delay, retry_after_seconds, retry_delay
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(shopify_rate_limiter.time, "monotonic", clock)
+    monkeypatch.setattr(settings, "SHOPIFY_BUCKET_HEADROOM", 2)
+    return clock
+
+
+def test_reserve_bursts_up_to_capacity_less_headroom_then_paces(clock):
+    bucket = LeakyBucket(capacity=10, leak_rate=2.0)
+    waits = [bucket.reserve() for _ in range(10)]
+    # 8 usable slots go out at once, then one every 1 / leak_rate seconds
+    assert waits[:8] == [0.0] * 8
+    assert waits[8:] == pytest.approx([0.5, 1.0])
+
+
+def test_reserve_drains_over_time(clock):
+    bucket = LeakyBucket(capacity=10, leak_rate=2.0)
+    for _ in range(8):
+        bucket.reserve()
+    clock.now += 4.0  # Eight units leak out
+    assert [bucket.reserve() for _ in range(8)] == [0.0] * 8
+
+
+def test_observe_only_moves_towards_the_stricter_estimate(clock):
+    bucket = LeakyBucket(capacity=40, leak_rate=2.0)
+    bucket.observe({"X-Shopify-Shop-Api-Call-Limit": "39/40"})
+    assert bucket.capacity == 40
+    assert bucket.reserve() == pytest.approx(1.0)  # 39 used, 37 usable: wait for two to leak
+    before = bucket._empty_at
+    bucket.observe({"X-Shopify-Shop-Api-Call-Limit": "1/40"})
+    assert bucket._empty_at == before
+
+
+def test_observe_ignores_missing_or_malformed_header(clock):
+    bucket = LeakyBucket(capacity=40, leak_rate=2.0)
+    bucket.observe({})
+    bucket.observe({"X-Shopify-Shop-Api-Call-Limit": "lots"})
+    assert bucket.capacity == 40 and bucket.reserve() == 0.0
+
+
+def test_block_for_delays_every_caller(clock):
+    bucket = LeakyBucket(capacity=40, leak_rate=2.0)
+    bucket.block_for(3.0)
+    bucket.block_for(1.0)  # A shorter block does not shorten the first
+    assert bucket.reserve() == pytest.approx(3.0)
+    assert bucket.reserve() == pytest.approx(3.0)
+
+
+def test_backoff_delay_is_jittered_and_capped(monkeypatch):
+    monkeypatch.setattr(settings, "SHOPIFY_BACKOFF_BASE_SECONDS", 0.5)
+    monkeypatch.setattr(settings, "SHOPIFY_BACKOFF_MAX_SECONDS", 4.0)
+    monkeypatch.setattr(shopify_rate_limiter.random, "uniform", lambda low, high: high)
+    assert [backoff_delay(attempt) for attempt in range(5)] == [0.5, 1.0, 2.0, 4.0, 4.0]
+    monkeypatch.setattr(shopify_rate_limiter.random, "uniform", lambda low, high: low)
+    assert backoff_delay(3) == 0
+
+
+def test_retry_after_seconds():
+    assert retry_after_seconds({"Retry-After": "2.5"}) == 2.5
+    assert retry_after_seconds({"Retry-After": "-1"}) == 0.0
+    assert retry_after_seconds({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) is None
+    assert retry_after_seconds({}) is None
+
+
+def test_retry_delay_429_honours_retry_after_and_blocks_the_store(clock):
+    bucket = LeakyBucket()
+    assert retry_delay(429, {"Retry-After": "2"}, 0, bucket) == 2.0
+    assert bucket.reserve() == pytest.approx(2.0)
+
+
+def test_retry_delay_5xx_backs_off_without_blocking(clock, monkeypatch):
+    monkeypatch.setattr(shopify_rate_limiter, "backoff_delay", lambda attempt: 0.25 * (attempt + 1))
+    bucket = LeakyBucket()
+    assert retry_delay(503, {}, 1, bucket) == 0.5
+    assert bucket.reserve() == 0.0
@@ -0,0 +1,22 @@
+"""
+Unit tests for follow-up page parameters on Link: rel="next" cursors (no network needed)
+"""
+from app.services.shopify_client import next_page_params
+
+NEXT = "https://shop.myshopify.com/admin/api/2023-10/orders.json?limit=250&page_info=abc"
+FIRST_QUERY = {"limit": 250, "status": "any", "updated_at_min": "2024-01-01T00:00:00+00:00", "fields": "id,updated_at"}
+
+
+def test_resends_fields_only():
+    # page_info links reject every other filter, so status and updated_at_min must not be repeated
+    assert next_page_params(NEXT, FIRST_QUERY) == {"fields": "id,updated_at"}
+
+
+def test_nothing_when_the_link_keeps_fields():
+    assert next_page_params(NEXT + "&fields=id%2Cupdated_at", FIRST_QUERY) is None
+
+
+def test_nothing_without_fields_or_next_link():
+    assert next_page_params(NEXT, {"limit": 250, "status": "any"}) is None
+    assert next_page_params(NEXT, None) is None
+    assert next_page_params(None, FIRST_QUERY) is None
@@ -0,0 +1,53 @@
+"""
+The shop timezone reported by test_connection is saved on the tenant, even
+when the tenant object was loaded through a different session than the one
+the ingestion service commits (as with the API's auth dependency).
+Needs the configured database with the schema migrated (alembic upgrade head).
+"""
+import uuid
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.tenant import Tenant
+from app.services.ingestion_service import IngestionService
+from app.services.shopify_mock_fixtures import ShopifyMockFixtures
+
+
+@pytest.fixture
+def tenant_id():
+    db = SessionLocal()
+    try:
+        db.execute(text("SELECT 1"))
+    except OperationalError:
+        db.close()
+        pytest.skip("database not reachable")
+    tenant = Tenant(
+        name=f"tz-{uuid.uuid4().hex[:8]}",
+        shopify_store_url=f"tz-{uuid.uuid4().hex[:8]}.myshopify.com",
+        shopify_access_token="x",
+        timezone="UTC",
+    )
+    db.add(tenant)
+    db.commit()
+    yield tenant.id
+    db.execute(text("DELETE FROM tenant_daily_stats WHERE tenant_id = :id"), {"id": tenant.id})
+    db.delete(tenant)
+    db.commit()
+    db.close()
+
+
+def test_connection_saves_shop_timezone(tenant_id, monkeypatch):
+    monkeypatch.setattr(settings, "USE_SHOPIFY_API", False)
+    expected = ShopifyMockFixtures.get_shop_response()["shop"]["iana_timezone"]
+
+    auth_db, service_db, check_db = SessionLocal(), SessionLocal(), SessionLocal()
+    try:
+        tenant = auth_db.get(Tenant, tenant_id)
+        assert IngestionService(service_db, tenant).test_connection()["status"] == "success"
+        assert check_db.get(Tenant, tenant_id).timezone == expected
+    finally:
+        auth_db.close()
+        service_db.close()
+        check_db.close()
@@ -0,0 +1,55 @@
+"""
+Unit tests for webhook coalescing and re-queueing (no database needed)
+"""
+from collections import OrderedDict
+import pytest
+from app.services.webhook_buffer import ACTION_DELETE, ACTION_UPSERT, WebhookBuffer, WebhookBufferFull
+
+
+def _buffer(max_events: int = 100) -> WebhookBuffer:
+    return WebhookBuffer(flush_max_events=max_events, flush_interval_seconds=60, max_events=max_events)
+
+
+def _order(order_id: int, updated_at: str, total_price: str) -> dict:
+    return {"id": order_id, "updated_at": updated_at, "total_price": total_price}
+
+
+def test_newest_updated_at_wins_regardless_of_arrival_order():
+    buffer = _buffer()
+    buffer.add(1, "orders/updated", _order(5, "2024-01-01T10:00:00-05:00", "2.00"))
+    # Delivered late: older than what is buffered (15:00Z vs 14:00Z)
+    buffer.add(1, "orders/updated", _order(5, "2024-01-01T14:00:00Z", "1.00"))
+    action, payload = buffer._events[(1, "orders")]["5"]
+    assert (action, payload["total_price"]) == (ACTION_UPSERT, "2.00")
+    buffer.add(1, "orders/updated", _order(5, "2024-01-01T16:00:00Z", "3.00"))
+    assert buffer._events[(1, "orders")]["5"][1]["total_price"] == "3.00"
+    assert buffer._size == 1
+
+
+def test_delete_wins_over_upserts():
+    buffer = _buffer()
+    buffer.add(1, "products/update", {"id": 7, "updated_at": "2024-01-01T00:00:00Z"})
+    buffer.add(1, "products/delete", {"id": 7})
+    buffer.add(1, "products/update", {"id": 7, "updated_at": "2024-01-02T00:00:00Z"})
+    assert buffer._events[(1, "products")]["7"][0] == ACTION_DELETE
+
+
+def test_buffer_full():
+    buffer = _buffer(max_events=1)
+    buffer.add(1, "orders/create", _order(1, "2024-01-01T00:00:00Z", "1.00"))
+    with pytest.raises(WebhookBufferFull):
+        buffer.add(1, "orders/create", _order(2, "2024-01-01T00:00:00Z", "1.00"))
+
+
+def test_requeue_keeps_newer_events_that_arrived_meanwhile():
+    buffer = _buffer()
+    failed = OrderedDict([
+        ("5", (ACTION_UPSERT, _order(5, "2024-01-01T10:00:00Z", "old"))),
+        ("6", (ACTION_UPSERT, _order(6, "2024-01-01T10:00:00Z", "kept"))),
+    ])
+    buffer.add(1, "orders/updated", _order(5, "2024-01-01T11:00:00Z", "new"))
+    buffer._requeue((1, "orders"), failed)
+    events = buffer._events[(1, "orders")]
+    assert events["5"][1]["total_price"] == "new"
+    assert events["6"][1]["total_price"] == "kept"
+    assert buffer._size == 2
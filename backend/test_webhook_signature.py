@@ -0,0 +1,41 @@
+"""
+Unit tests for Shopify webhook HMAC verification (no database needed)
+"""
+import base64
+import hashlib
+import hmac
+import pytest
+from app.core.config import settings
+from app.core.security import verify_shopify_webhook
+
+BODY = b'{"id": 1, "updated_at": "2024-01-01T00:00:00Z"}'
+
+
+def _sign(body: bytes, secret: str) -> str:
+    return base64.b64encode(hmac.new(secret.encode("utf-8"), body, hashlib.sha256).digest()).decode("utf-8")
+
+
+@pytest.fixture
+def secret(monkeypatch):
+    monkeypatch.setattr(settings, "SHOPIFY_API_SECRET", "s3cret-for-tests")
+    return "s3cret-for-tests"
+
+
+def test_accepts_valid_signature(secret):
+    assert verify_shopify_webhook(BODY, _sign(BODY, secret))
+
+
+def test_rejects_tampered_body(secret):
+    assert not verify_shopify_webhook(BODY + b" ", _sign(BODY, secret))
+
+
+def test_rejects_other_key_and_missing_header(secret):
+    assert not verify_shopify_webhook(BODY, _sign(BODY, "another-secret"))
+    assert not verify_shopify_webhook(BODY, None)
+    assert not verify_shopify_webhook(BODY, "")
+
+
+@pytest.mark.parametrize("placeholder", ["", "your_shopify_api_secret", "your_app_secret"])
+def test_placeholder_secret_verifies_nothing(monkeypatch, placeholder):
+    monkeypatch.setattr(settings, "SHOPIFY_API_SECRET", placeholder)
+    assert not verify_shopify_webhook(BODY, _sign(BODY, placeholder))